@@ -1,28 +1,31 @@
+import logging
+import math
 import numpy as np
 from scipy.signal import find_peaks
 
+logger = logging.getLogger(__name__)
+
 # ----------------- Helper Functions -----------------
 
 
 def get_keypoint(keypoints, keypoint_index):
     """Retrieve a keypoint or return None if missing."""
     try:
-        return keypoints[keypoint_index].tolist()
-    except (IndexError, AttributeError):
+        return keypoints[keypoint_index]
+    except IndexError:
         return None
 
 
 def calculate_distance(point1, point2):
     """Calculate Euclidean distance between two points."""
-    return np.linalg.norm(np.array(point1) - np.array(point2))
+    return math.hypot(point1[0] - point2[0], point1[1] - point2[1])
 
 
 def calculate_angle(a, b, c):
     """Calculate the angle between three points in degrees."""
-    a, b, c = np.array(a), np.array(b), np.array(c)
-    radians = np.arctan2(c[1]-b[1], c[0]-b[0]) - \
-        np.arctan2(a[1]-b[1], a[0]-b[0])
-    angle = np.abs(radians * 180.0 / np.pi)
+    radians = math.atan2(c[1]-b[1], c[0]-b[0]) - \
+        math.atan2(a[1]-b[1], a[0]-b[0])
+    angle = abs(math.degrees(radians))
     return angle if angle <= 180 else 360 - angle
 
 
@@ -31,8 +34,8 @@ def detect_strides(ankle_positions, stride_threshold=50):
     if len(ankle_positions) < 2:
         return []
 
-    distances = [calculate_distance(ankle_positions[i], ankle_positions[i-1])
-                 for i in range(1, len(ankle_positions))]
+    # Frame-to-frame ankle displacement for the whole history in one array op
+    distances = np.linalg.norm(np.diff(np.asarray(ankle_positions, dtype=float), axis=0), axis=1)
     peaks, _ = find_peaks(distances, height=stride_threshold)
     return peaks.tolist()
 
@@ -42,10 +45,10 @@ def detect_strides(ankle_positions, stride_threshold=50):
 def check_approach_strides(stride_indices, required_strides=8, side=''):
     """Check if the required number of approach strides is achieved."""
     if len(stride_indices) < required_strides:
-        print(
-            f"{side}: Insufficient strides detected (need at least {required_strides})")
+        logger.debug(
+            "%s: Insufficient strides detected (need at least %s)", side, required_strides)
         return False
-    print(f"{side}: Approach completed in {len(stride_indices)} strides.")
+    logger.debug("%s: Approach completed in %s strides.", side, len(stride_indices))
     return True
 
 
@@ -58,10 +61,10 @@ def check_hurdle_contacts(leg_positions, stride_indices, required_contacts=4, si
             hurdle_contacts += 1
 
     if hurdle_contacts < required_contacts:
-        print(f"{side}: Insufficient hurdle contacts (need at least {required_contacts}, detected {hurdle_contacts})")
+        logger.debug("%s: Insufficient hurdle contacts (need at least %s, detected %s)", side, required_contacts, hurdle_contacts)
         return False
 
-    print(f"{side}: Hurdle contacts detected = {hurdle_contacts} out of {len(stride_indices) - 1}")
+    logger.debug("%s: Hurdle contacts detected = %s out of %s", side, hurdle_contacts, len(stride_indices) - 1)
     return True
 
 
@@ -72,10 +75,10 @@ def check_lead_leg_height(leg_positions, stride_indices, lead_leg_height_thresho
     )
 
     if not lead_leg_passes_hurdle:
-        print(f"{side}: Lead leg does not pass above the hurdle.")
+        logger.debug("%s: Lead leg does not pass above the hurdle.", side)
         return False
 
-    print(f"{side}: Lead leg passes above the hurdle.")
+    logger.debug("%s: Lead leg passes above the hurdle.", side)
     return True
 
 
@@ -86,26 +89,26 @@ def check_torso_movement(torso_positions, leg_positions, stride_indices, torso_m
     )
 
     if not torso_movement:
-        print(f"{side}: Torso does not move toward the lead leg.")
+        logger.debug("%s: Torso does not move toward the lead leg.", side)
         return False
 
-    print(f"{side}: Torso moves toward the lead leg.")
+    logger.debug("%s: Torso moves toward the lead leg.", side)
     return True
 
 
 def check_high_knee_on_second_contact(leg_positions, stride_indices, high_knee_threshold=0.15, side=''):
     """Check if the second contact involves a high knee."""
     if len(stride_indices) < 2:
-        print(f"{side}: Not enough strides to check for high knee on second contact.")
+        logger.debug("%s: Not enough strides to check for high knee on second contact.", side)
         return False
 
     # Assuming the second contact is the second stride
     second_contact_index = stride_indices[1]
     if leg_positions[second_contact_index][1] <= high_knee_threshold:
-        print(f"{side}: Second contact does not involve a high knee.")
+        logger.debug("%s: Second contact does not involve a high knee.", side)
         return False
 
-    print(f"{side}: Second contact involves a high knee.")
+    logger.debug("%s: Second contact involves a high knee.", side)
     return True
 
 
@@ -142,7 +145,7 @@ def evaluate_hurdling(player_coords):
 
     for data in player_coords:
         frame = data['frame']
-        keypoints = data['keypoints']
+        keypoints = data['keypoints'].tolist()
 
         # Get COCO-compliant keypoints
         left_hip = get_keypoint(keypoints, 11)  # Index 11: Left hip
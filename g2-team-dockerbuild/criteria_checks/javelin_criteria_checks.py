@@ -1,29 +1,32 @@
+import logging
+import math
 import numpy as np
 from scipy.signal import butter, filtfilt, find_peaks
 from scipy.stats import linregress
 
+logger = logging.getLogger(__name__)
+
 
 # ----------------- Helper Functions -----------------
 
 def get_keypoint(keypoints, keypoint_index):
     """Retrieve a keypoint or return None if missing."""
     try:
-        return keypoints[keypoint_index].tolist()
-    except (IndexError, AttributeError):
+        return keypoints[keypoint_index]
+    except IndexError:
         return None
 
 
 def calculate_distance(point1, point2):
     """Calculate Euclidean distance between two points."""
-    return np.linalg.norm(np.array(point1) - np.array(point2))
+    return math.hypot(point1[0] - point2[0], point1[1] - point2[1])
 
 
 def calculate_angle(a, b, c):
     """Calculate the angle between three points in degrees."""
-    a, b, c = np.array(a), np.array(b), np.array(c)
-    radians = np.arctan2(c[1]-b[1], c[0]-b[0]) - \
-        np.arctan2(a[1]-b[1], a[0]-b[0])
-    angle = np.abs(radians * 180.0 / np.pi)
+    radians = math.atan2(c[1]-b[1], c[0]-b[0]) - \
+        math.atan2(a[1]-b[1], a[0]-b[0])
+    angle = abs(math.degrees(radians))
     return angle if angle <= 180 else 360 - angle
 
 
@@ -145,13 +148,13 @@ def javelin_drawn_backward(shoulder_positions, wrist_positions, stride_indices,
 
     # Validate input data
     if not shoulder_positions or not wrist_positions or not stride_indices:
-        print(f"{side}: Missing input data")
+        logger.debug("%s: Missing input data", side)
         return False
 
     # Handle insufficient strides
     valid_strides = min(len(stride_indices), last_n_strides)
     if valid_strides < 1:
-        print(f"{side}: No valid strides available")
+        logger.debug("%s: No valid strides available", side)
         return False
 
     # Extract continuous window for last N strides
@@ -173,7 +176,7 @@ def javelin_drawn_backward(shoulder_positions, wrist_positions, stride_indices,
             continue
 
     if len(rel_positions) < 10:  # Minimum 10 valid frames
-        print(f"{side}: Insufficient valid data ({len(rel_positions)} frames)")
+        logger.debug("%s: Insufficient valid data (%s frames)", side, len(rel_positions))
         return False
 
     # Trend analysis with linear regression
@@ -183,8 +186,8 @@ def javelin_drawn_backward(shoulder_positions, wrist_positions, stride_indices,
     # Consistency check
     backward_ratio = np.mean(np.array(rel_positions) > 0)
 
-    print(f"{side}: Backward trend slope: {slope:.3f}")
-    print(f"{side}: Backward frames ratio: {backward_ratio:.1%}")
+    logger.debug("%s: Backward trend slope: %.3f", side, slope)
+    logger.debug("%s: Backward frames ratio: %.1f%%", side, backward_ratio * 100)
 
     # Combined decision logic
     return (slope < trend_threshold and
@@ -199,8 +202,8 @@ def pelvis_rotation_and_javelin_drawn(hip_positions, shoulder_positions, wrist_p
                                       wrist_stability_threshold=0.01):
 
     if len(hip_positions) < 3 or len(shoulder_positions) < 3 or len(wrist_positions) < 3:
-        print(
-            f"{side}: Insufficient data for pelvis rotation and javelin check (need at least 3 frames)")
+        logger.debug(
+            "%s: Insufficient data for pelvis rotation and javelin check (need at least 3 frames)", side)
         return False
 
     # Calculate horizontal and vertical movement for hip, shoulder, and wrist
@@ -228,33 +231,33 @@ def pelvis_rotation_and_javelin_drawn(hip_positions, shoulder_positions, wrist_p
 
     # Check for pelvis rotation (hip moves inward)
     if hip_move_x < hip_rotation_threshold:
-        print(f"{side}: Hip movement ({hip_move_x:.2f}) is below rotation threshold ({hip_rotation_threshold:.2f})")
+        logger.debug("%s: Hip movement (%.2f) is below rotation threshold (%.2f)", side, hip_move_x, hip_rotation_threshold)
         return False
 
     # Check for javelin drawn back (wrist is behind shoulder)
     if wrist_behind_distance < wrist_behind_threshold:
-        print(f"{side}: Wrist is not sufficiently behind shoulder ({wrist_behind_distance:.2f} < {wrist_behind_threshold:.2f})")
+        logger.debug("%s: Wrist is not sufficiently behind shoulder (%.2f < %.2f)", side, wrist_behind_distance, wrist_behind_threshold)
         return False
 
     # Check for pelvis rotation angle
     if pelvis_angle > pelvis_angle_threshold:
-        print(f"{side}: Pelvis rotation angle ({pelvis_angle:.2f}) exceeds threshold ({pelvis_angle_threshold:.2f})")
+        logger.debug("%s: Pelvis rotation angle (%.2f) exceeds threshold (%.2f)", side, pelvis_angle, pelvis_angle_threshold)
         return False
 
     # Check for vertical alignment between pelvis and shoulder
     if vertical_misalignment > vertical_alignment_threshold:
-        print(f"{side}: Vertical misalignment ({vertical_misalignment:.2f}) exceeds threshold ({vertical_alignment_threshold:.2f})")
+        logger.debug("%s: Vertical misalignment (%.2f) exceeds threshold (%.2f)", side, vertical_misalignment, vertical_alignment_threshold)
         return False
 
     # Check for stability
     if hip_stability_x > hip_stability_threshold:
-        print(f"{side}: Hip movement is not stable ({hip_stability_x:.2f})")
+        logger.debug("%s: Hip movement is not stable (%.2f)", side, hip_stability_x)
         return False
     if shoulder_stability_x > shoulder_stability_threshold:
-        print(f"{side}: Shoulder movement is not stable ({shoulder_stability_x:.2f})")
+        logger.debug("%s: Shoulder movement is not stable (%.2f)", side, shoulder_stability_x)
         return False
     if wrist_stability_x > wrist_stability_threshold:
-        print(f"{side}: Wrist movement is not stable ({wrist_stability_x:.2f})")
+        logger.debug("%s: Wrist movement is not stable (%.2f)", side, wrist_stability_x)
         return False
 
     return True
@@ -266,8 +269,8 @@ def impulse_step_executed(ankle_positions, knee_positions, hip_positions, side,
                           stability_threshold=0.01):
 
     if len(ankle_positions) < 3 or len(knee_positions) < 3 or len(hip_positions) < 3:
-        print(
-            f"{side}: Insufficient data for impulse step check (need at least 3 frames)")
+        logger.debug(
+            "%s: Insufficient data for impulse step check (need at least 3 frames)", side)
         return False
 
     # Calculate horizontal movement for ankle, knee, and hip
@@ -282,43 +285,43 @@ def impulse_step_executed(ankle_positions, knee_positions, hip_positions, side,
     hip_stability_x = abs(hip_positions[-1][0] - hip_positions[-3][0]) / 2
 
     # Debugging output
-    print(f"{side}: Ankle movement (x) = {ankle_move_x:.2f}")
-    print(f"{side}: Knee movement (x) = {knee_move_x:.2f}")
-    print(f"{side}: Hip movement (x) = {hip_move_x:.2f}")
-    print(f"{side}: Ankle stability (x) = {ankle_stability_x:.2f}")
-    print(f"{side}: Knee stability (x) = {knee_stability_x:.2f}")
-    print(f"{side}: Hip stability (x) = {hip_stability_x:.2f}")
+    logger.debug("%s: Ankle movement (x) = %.2f", side, ankle_move_x)
+    logger.debug("%s: Knee movement (x) = %.2f", side, knee_move_x)
+    logger.debug("%s: Hip movement (x) = %.2f", side, hip_move_x)
+    logger.debug("%s: Ankle stability (x) = %.2f", side, ankle_stability_x)
+    logger.debug("%s: Knee stability (x) = %.2f", side, knee_stability_x)
+    logger.debug("%s: Hip stability (x) = %.2f", side, hip_stability_x)
 
     # Check for proper sequencing (ankle > knee > hip)
     if not (ankle_move_x > knee_move_x and knee_move_x > hip_move_x):
-        print(f"{side}: Improper sequencing (ankle: {ankle_move_x:.2f}, knee: {knee_move_x:.2f}, hip: {hip_move_x:.2f})")
+        logger.debug("%s: Improper sequencing (ankle: %.2f, knee: %.2f, hip: %.2f)", side, ankle_move_x, knee_move_x, hip_move_x)
         return False
 
     # Check for minimum ankle movement
     if ankle_move_x < ankle_threshold:
-        print(
-            f"{side}: Ankle movement ({ankle_move_x:.2f}) is below threshold ({ankle_threshold:.2f})")
+        logger.debug(
+            "%s: Ankle movement (%.2f) is below threshold (%.2f)", side, ankle_move_x, ankle_threshold)
         return False
 
     # Check for maximum knee and hip movement
     if knee_move_x > knee_threshold:
-        print(
-            f"{side}: Knee movement ({knee_move_x:.2f}) exceeds threshold ({knee_threshold:.2f})")
+        logger.debug(
+            "%s: Knee movement (%.2f) exceeds threshold (%.2f)", side, knee_move_x, knee_threshold)
         return False
     if hip_move_x > hip_threshold:
-        print(
-            f"{side}: Hip movement ({hip_move_x:.2f}) exceeds threshold ({hip_threshold:.2f})")
+        logger.debug(
+            "%s: Hip movement (%.2f) exceeds threshold (%.2f)", side, hip_move_x, hip_threshold)
         return False
 
     # Check for stability
     if ankle_stability_x > stability_threshold:
-        print(f"{side}: Ankle movement is not stable ({ankle_stability_x:.2f})")
+        logger.debug("%s: Ankle movement is not stable (%.2f)", side, ankle_stability_x)
         return False
     if knee_stability_x > stability_threshold:
-        print(f"{side}: Knee movement is not stable ({knee_stability_x:.2f})")
+        logger.debug("%s: Knee movement is not stable (%.2f)", side, knee_stability_x)
         return False
     if hip_stability_x > stability_threshold:
-        print(f"{side}: Hip movement is not stable ({hip_stability_x:.2f})")
+        logger.debug("%s: Hip movement is not stable (%.2f)", side, hip_stability_x)
         return False
 
     return True
@@ -331,8 +334,8 @@ def blocking_step_executed(ankle_positions, hip_positions, side,
                            stability_threshold=0.01):
 
     if len(ankle_positions) < 3 or len(hip_positions) < 3:
-        print(
-            f"{side}: Insufficient data for blocking step check (need at least 3 frames)")
+        logger.debug(
+            "%s: Insufficient data for blocking step check (need at least 3 frames)", side)
         return False
 
     # Calculate horizontal and vertical movement for ankle and hip
@@ -357,27 +360,27 @@ def blocking_step_executed(ankle_positions, hip_positions, side,
 
     # Stricter ankle movement check (horizontal and vertical)
     if ankle_move_x > ankle_threshold:
-        print(f"{side}: Ankle horizontal movement ({ankle_move_x:.2f}) exceeds threshold ({ankle_threshold:.2f})")
+        logger.debug("%s: Ankle horizontal movement (%.2f) exceeds threshold (%.2f)", side, ankle_move_x, ankle_threshold)
         return False
     if ankle_move_y > ankle_vertical_threshold:
-        print(f"{side}: Ankle vertical movement ({ankle_move_y:.2f}) exceeds threshold ({ankle_vertical_threshold:.2f})")
+        logger.debug("%s: Ankle vertical movement (%.2f) exceeds threshold (%.2f)", side, ankle_move_y, ankle_vertical_threshold)
         return False
 
     # Stricter hip movement check (horizontal and vertical)
     if hip_move_x < hip_threshold:
-        print(f"{side}: Hip horizontal movement ({hip_move_x:.2f}) is below threshold ({hip_threshold:.2f})")
+        logger.debug("%s: Hip horizontal movement (%.2f) is below threshold (%.2f)", side, hip_move_x, hip_threshold)
         return False
     if hip_move_y > hip_vertical_threshold:
-        print(f"{side}: Hip vertical movement ({hip_move_y:.2f}) exceeds threshold ({hip_vertical_threshold:.2f})")
+        logger.debug("%s: Hip vertical movement (%.2f) exceeds threshold (%.2f)", side, hip_move_y, hip_vertical_threshold)
         return False
 
     # Stability check (movement consistency over the last 3 frames)
     if ankle_stability_x > stability_threshold or ankle_stability_y > stability_threshold:
-        print(f"{side}: Ankle movement is not stable (x: {ankle_stability_x:.2f}, y: {ankle_stability_y:.2f})")
+        logger.debug("%s: Ankle movement is not stable (x: %.2f, y: %.2f)", side, ankle_stability_x, ankle_stability_y)
         return False
     if hip_stability_x > stability_threshold or hip_stability_y > stability_threshold:
-        print(
-            f"{side}: Hip movement is not stable (x: {hip_stability_x:.2f}, y: {hip_stability_y:.2f})")
+        logger.debug(
+            "%s: Hip movement is not stable (x: %.2f, y: %.2f)", side, hip_stability_x, hip_stability_y)
         return False
 
     return True
@@ -389,7 +392,7 @@ def throw_initiated(hip_positions, shoulder_positions, wrist_positions, side,
                     progressive_movement_threshold=0.01):
 
     if len(hip_positions) < 2 or len(shoulder_positions) < 2 or len(wrist_positions) < 2:
-        print(f"{side}: Insufficient data for throw initiation check")
+        logger.debug("%s: Insufficient data for throw initiation check", side)
         return False
 
     hip_move = hip_positions[-1][0] - hip_positions[-2][0]
@@ -451,10 +454,13 @@ def evaluate_javelin_throw(player_coords):
     }
 
     stride_indices = []
+    # Ankle history lengths as of the last frame with both ankles; strides are only
+    # needed for criterion 1, so they are computed from this snapshot when it is checked
+    stride_history = None
 
-    for data in player_coords:
+    for position, data in enumerate(player_coords):
         frame = data['frame']
-        keypoints = data['keypoints']
+        keypoints = data['keypoints'].tolist()
 
         # Get COCO-compliant keypoints (indices 0-16)
         current_points = {
@@ -482,15 +488,20 @@ def evaluate_javelin_throw(player_coords):
 
         # Detect strides using right ankle (assuming right-handed throw)
         if current_points['left']['ankle'] and current_points['right']['ankle']:
+            stride_history = (len(trackers['left']['ankle']), len(trackers['right']['ankle']))
+
+        if position == len(player_coords) - 1 and stride_history is not None:
+            left_count, right_count = stride_history
             stride_indices = detect_strides(
-                trackers['left']['ankle'], trackers['right']['ankle'])  # Pass right ankle data
+                trackers['left']['ankle'][:left_count], trackers['right']['ankle'][:right_count])
+            stride_history = None
 
         # Evaluate criteria for each side
 
         for side in ['left', 'right']:
 
             # Criterion 1: Only check at end of stride sequence
-            if frame == len(player_coords) - 1:  # Last frame check
+            if position == len(player_coords) - 1:  # Last frame check
                 if javelin_drawn_backward(trackers[side]['shoulder'],
                                           trackers[side]['wrist'],
                                           stride_indices, side):
@@ -1,147 +1,167 @@
-import math
 import logging
 
+import numpy as np
+
+# ------------- Logging --------------------
+
+logger = logging.getLogger(__name__)
+
+#keypoints read by the shot put criteria (nose, arms, hips, legs)
+KEYPOINT_INDICES = (0, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16)
+
+#criterion thresholds (degrees unless noted)
+GLIDE_KNEE_MAX = 180
+GLIDE_ORIENT_MIN = 70
+ASSIST_KNEE_MAX = 160
+STIFF_KNEE_MIN = 140
+PUNCH_ELBOW_MIN = 160
+PUNCH_HIP_MIN = 30
+RELEASE_DIST_SQ_MAX = 50 * 50  #squared wrist-to-nose distance
+RELEASE_ANGLE_LO = 30
+RELEASE_ANGLE_HI = 60
+
+#phase detection: wrist keypoints below this confidence are treated as missing
+WRIST_CONF_MIN = 0.5
+#frames in the running median over wrist speed; longer than a one-frame dropout or person switch
+SPEED_MEDIAN_WINDOW = 5
+
+
+# ------------- geometry over (N, 2) keypoint arrays --------------------
+
+def compute_angles_3pts(a, b, c):
+    #angle at b for every frame at once, NaN where the angle is undefined
+    v1 = a - b
+    v2 = c - b
+    mag1 = np.hypot(v1[:, 0], v1[:, 1])
+    mag2 = np.hypot(v2[:, 0], v2[:, 1])
+    dot = v1[:, 0] * v2[:, 0] + v1[:, 1] * v2[:, 1]
+    cross = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
+    angles = np.degrees(np.arctan2(np.abs(cross), dot))
+    angles[(mag1 < 1e-5) | (mag2 < 1e-5)] = np.nan
+    return angles
+
+def shoulder_orientations(left_shoulder, right_shoulder):
+    dx = right_shoulder[:, 0] - left_shoulder[:, 0]
+    dy = right_shoulder[:, 1] - left_shoulder[:, 1]
+    return np.degrees(np.arctan2(dy, dx))
+
+def keypoint_columns(player_coords):
+    #one contiguous (N, 2) float32 array per keypoint, NaN where the keypoint is missing
+    return {
+        i: np.asarray(
+            [data['keypoints'][i] if i < len(data['keypoints']) else (np.nan, np.nan) for data in player_coords],
+            dtype=np.float32
+        ).reshape(-1, 2)
+        for i in KEYPOINT_INDICES
+    }
+
+def compute_angle_table(cols):
+    #every angle and distance the criteria use, computed once for the whole clip
+    right_wrist_dx = cols[10][:, 0] - cols[6][:, 0]
+    right_wrist_dy = cols[10][:, 1] - cols[6][:, 1]
+    nose_dx = cols[10][:, 0] - cols[0][:, 0]
+    nose_dy = cols[10][:, 1] - cols[0][:, 1]
+    return {
+        #knee angles measured against the opposite hip (glide stance)
+        'glide_right_knee': compute_angles_3pts(cols[11], cols[14], cols[16]),
+        'glide_left_knee': compute_angles_3pts(cols[12], cols[13], cols[15]),
+        'shoulder_orient': shoulder_orientations(cols[5], cols[6]),
+        'left_knee': compute_angles_3pts(cols[11], cols[13], cols[15]),
+        'right_knee': compute_angles_3pts(cols[12], cols[14], cols[16]),
+        'left_elbow': compute_angles_3pts(cols[5], cols[7], cols[9]),
+        'right_elbow': compute_angles_3pts(cols[6], cols[8], cols[10]),
+        'shoulder_to_hip': compute_angles_3pts(cols[5], cols[11], cols[6]),
+        'arm_release': np.degrees(np.arctan2(right_wrist_dy, right_wrist_dx)),
+        'wrist_nose_sq_dist': nose_dx * nose_dx + nose_dy * nose_dy
+    }
+
+def slice_arrays(arrays, start, end):
+    return {key: arr[start:end] for key, arr in arrays.items()}
 
-# ------------- helper geometry functions --------------------
-
-def get_keypoint(kpts, idx):
-    if idx < len(kpts):
-        return kpts[idx]
-    return None
-
-# def distance_2d(p1, p2):
-#     if p1 is None or p2 is None:
-#         return None
-#     return math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-def distance_2d(point1, point2):
-    return math.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
-
-def compute_angle_3pts(a, b, c):
-    if a is None or b is None or c is None:
-        return None
-    ax, ay = a
-    bx, by = b
-    cx, cy = c
-    v1 = (ax - bx, ay - by)
-    v2 = (cx - bx, cy - by)
-    mag1 = math.hypot(v1[0], v1[1])
-    mag2 = math.hypot(v2[0], v2[1])
-    if mag1 < 1e-5 or mag2 < 1e-5:
-        return None
-    dot = v1[0] * v2[0] + v1[1] * v2[1]
-    cos_angle = max(-1.0, min(1.0, dot / (mag1 * mag2)))
-    try:
-        angle_rad = math.acos(cos_angle)
-        angle_deg = math.degrees(angle_rad)
-        return angle_deg
-    except ValueError:
-        # logger.debug(f"Invalid angle calculation with cos_angle={cos_angle}")
-        return None
-
-def shoulder_orientation(left_shoulder, right_shoulder):
-    if left_shoulder is None or right_shoulder is None:
-        return None
-    dx = right_shoulder[0] - left_shoulder[0]
-    dy = right_shoulder[1] - left_shoulder[1]
-    return math.degrees(math.atan2(dy, dx))
+def running_nanmedian(values, window):
+    #median over a centered window, ignoring NaNs; NaN only where the whole window is NaN
+    if len(values) < window:
+        return values
+    padded = np.pad(values, window // 2, mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    smoothed = np.full(len(values), np.nan, dtype=values.dtype)
+    has_value = np.isfinite(windows).any(axis=1)
+    smoothed[has_value] = np.nanmedian(windows[has_value], axis=1)
+    return smoothed
 
 # ------------- phase detection and segmentation --------------------
 
-def detect_phase_transitions(player_coords):
-    if not player_coords:
-        # logger.debug("player_coords is empty.")
+def detect_phase_transitions(cols, wrist_conf=None):
+    total = len(cols[10])
+    if total == 0:
+        logger.debug("player_coords is empty.")
         return 0, 0
 
-    total = len(player_coords)
-    one_third = total // 3
-    two_thirds = (2 * total) // 3
+    #right wrist (throwing arm) position per frame; YOLO reports undetected keypoints as (0, 0),
+    #so those and low-confidence wrists are gaps rather than a jump to the image corner
+    right_wrist = cols[10].copy()
+    missing = (right_wrist == 0).all(axis=1)
+    if wrist_conf is not None:
+        missing |= wrist_conf < WRIST_CONF_MIN
+    right_wrist[missing] = np.nan
 
-    preparation_end_index = one_third
-    transition_end_index = two_thirds
+    #the push-out punch is where the wrist moves fastest; the running median keeps a single-frame
+    #jump (a dropout the confidence missed, or a switch to another person when untracked) from winning
+    wrist_speed = running_nanmedian(np.linalg.norm(np.diff(right_wrist, axis=0), axis=1), SPEED_MEDIAN_WINDOW)
+    finite_speed = wrist_speed[np.isfinite(wrist_speed)]
+    if len(finite_speed) < SPEED_MEDIAN_WINDOW or finite_speed.max() <= np.median(finite_speed):
+        #no usable wrist track or no distinct speed peak, fall back to equal thirds
+        return total // 3, (2 * total) // 3
 
-    # logger.debug(f"preparation_end_index={preparation_end_index}, transition_end_index={transition_end_index}")
+    release_start_index = int(np.nanargmax(wrist_speed))
+    if release_start_index < 2:
+        #a peak on the first frames would leave the preparation and transition phases empty
+        return total // 3, (2 * total) // 3
+
+    preparation_end_index = release_start_index // 2
+    transition_end_index = release_start_index
+
+    logger.debug("preparation_end_index=%d, transition_end_index=%d", preparation_end_index, transition_end_index)
 
     return preparation_end_index, transition_end_index
 
-def segment_video_into_phases(player_coords, preparation_end_index, transition_end_index):
-    preparation_phase_frames = player_coords[:preparation_end_index]
-    transition_phase_frames = player_coords[preparation_end_index:transition_end_index]
-    release_phase_frames = player_coords[transition_end_index:]
+def segment_video_into_phases(frame_ids, preparation_end_index, transition_end_index):
+    preparation_phase_frames = frame_ids[:preparation_end_index]
+    transition_phase_frames = frame_ids[preparation_end_index:transition_end_index]
+    release_phase_frames = frame_ids[transition_end_index:]
 
-    # # logger.debug(f"Segments: preparation_frames={len(preparation_phase_frames)}, "
-    #              f"transition_frames={len(transition_phase_frames)}, "
-    #              f"release_frames={len(release_phase_frames)}")
+    logger.debug("Segments: preparation_frames=%d, transition_frames=%d, release_frames=%d",
+                 len(preparation_phase_frames), len(transition_phase_frames), len(release_phase_frames))
 
     return preparation_phase_frames, transition_phase_frames, release_phase_frames
 
 # ------------- criterion checks by phase --------------------
-def evaluate_preparation_phase(preparation_frames):
+#each phase receives its frame numbers and the angle table sliced to its own frames;
+#missing keypoints give NaN entries, which fail every comparison
+
+def evaluate_preparation_phase(preparation_frames, angles):
     partial_scoring = {
-        'Initiate the glide phase from a folded low leg, facing away from the throwing direction.': 0
+        'Initiate the glide phase from a folded low leg, facing away from the throwing direction': 0
     }
     partial_eval_frames = {
         1: []
     }
 
-    # logger.debug(f"PHASE=Preparation: Processing {len(preparation_frames)} frames for Criterion 1.")
-
-    for idx, data in enumerate(preparation_frames):
-        frame = data.get('frame', idx)
-        kpts = data['keypoints']
-
-        # logger.debug(f"PHASE=Preparation Frame={frame}: Checking Criterion 1...")
-
-        left_hip = get_keypoint(kpts, 11)
-        right_hip = get_keypoint(kpts, 12)
-        left_knee = get_keypoint(kpts, 13)
-        right_knee = get_keypoint(kpts, 14)
-        left_ankle = get_keypoint(kpts, 15)
-        right_ankle = get_keypoint(kpts, 16)
-        left_shoulder = get_keypoint(kpts, 5)
-        right_shoulder = get_keypoint(kpts, 6)
-
-        #llog extracted keypoints
-        # # logger.debug(f"Frame {frame}: left_hip={left_hip}, right_hip={right_hip}, "
-        #              f"left_knee={left_knee}, right_knee={right_knee}, "
-        #              f"left_ankle={left_ankle}, right_ankle={right_ankle}, "
-        #              f"left_shoulder={left_shoulder}, right_shoulder={right_shoulder}")
-
-        #criterion 1: glide phase initiated from a folded low leg, with back to the throwing direction
-        if (left_hip and right_hip and left_knee and right_knee and
-            left_ankle and right_ankle and left_shoulder and right_shoulder):
-
-            #angle at the right knee
-            right_knee_angle = compute_angle_3pts(left_hip, right_knee, right_ankle)
-            left_knee_angle = compute_angle_3pts(right_hip, left_knee, left_ankle)
-
-            #shoulder orientation
-            orient_angle = shoulder_orientation(left_shoulder, right_shoulder)
-
-            # logger.debug(f"Frame {frame}: right_knee_angle={right_knee_angle:.2f} degrees, "
-                        #  f"left_knee_angle={left_knee_angle:.2f} degrees, "
-                        #  f"shoulder_orientation={orient_angle:.2f} degrees")
-
-            #define thresholds
-            if (right_knee_angle is not None and left_knee_angle is not None and orient_angle is not None):
-                if (right_knee_angle < 180 and left_knee_angle < 180 and
-                    (orient_angle > 70 or orient_angle < -70)):
-                    partial_scoring['Initiate the glide phase from a folded low leg, facing away from the throwing direction.'] = 1
-                    partial_eval_frames[1].append(frame)
-                    # logger.debug(f"Frame {frame}: Criterion 1 passed.")
-                # else:
-                    # logger.debug(f"Frame {frame}: Criterion 1 failed: "
-        #                          f"right_knee_angle={right_knee_angle:.2f}, "
-        #                          f"left_knee_angle={left_knee_angle:.2f}, "
-        #                          f"shoulder_orientation={orient_angle:.2f}")
-        # else:
-            # logger.debug(f"Frame {frame}: Missing keypoints required for Criterion 1 evaluation.")
-
-    # logger.debug(f"Final scoring for Preparation phase: {partial_scoring}")
+    logger.debug("PHASE=Preparation: Processing %d frames for Criterion 1.", len(preparation_frames))
+
+    #criterion 1: glide phase initiated from a folded low leg, with back to the throwing direction
+    criterion_1 = ((angles['glide_right_knee'] < GLIDE_KNEE_MAX) & (angles['glide_left_knee'] < GLIDE_KNEE_MAX) &
+                   (np.abs(angles['shoulder_orient']) > GLIDE_ORIENT_MIN))
+
+    partial_scoring['Initiate the glide phase from a folded low leg, facing away from the throwing direction'] = int(criterion_1.any())
+    partial_eval_frames[1] = preparation_frames[criterion_1].tolist()
+
+    logger.debug("Final scoring for Preparation phase: %s", partial_scoring)
     return partial_scoring, partial_eval_frames
 
-def evaluate_transition_phase(transition_frames):
+def evaluate_transition_phase(transition_frames, angles):
     partial_scoring = {
-        'Execute a flat hop to pull the assisting leg under the pelvis.': 0,
+        'Execute a flat hop to pull the assisting leg under the pelvis': 0,
         'Sting leg is down while keeping the butt leg folded after the flat hop': 0
     }
     partial_eval_frames = {
@@ -149,148 +169,82 @@ def evaluate_transition_phase(transition_frames):
         3: []
     }
 
-    # logger.debug(f"PHASE=Transition: Processing {len(transition_frames)} frames for Criteria 2 & 3.")
-
-    for idx, data in enumerate(transition_frames):
-        frame = data.get('frame', idx + len(transition_frames))
-        kpts = data['keypoints']
-
-        # logger.debug(f"PHASE=Transition Frame={frame}: Checking Criteria 2 & 3...")
-
-        left_hip = get_keypoint(kpts, 11)
-        right_hip = get_keypoint(kpts, 12)
-        left_knee = get_keypoint(kpts, 13)
-        right_knee = get_keypoint(kpts, 14)
-        left_ankle = get_keypoint(kpts, 15)
-        right_ankle = get_keypoint(kpts, 16)
-
-        # logger.debug(f"Frame {frame}: left_hip={left_hip}, right_hip={right_hip}, "
-                    #  f"left_knee={left_knee}, right_knee={right_knee}, "
-                    #  f"left_ankle={left_ankle}, right_ankle={right_ankle}")
-
-        #criterion 2: using a flat hop, assisting leg pulled under the pelvis
-        if (left_hip and left_knee and left_ankle):
-            #assuming left leg is assisting leg
-            left_knee_angle = compute_angle_3pts(left_hip, left_knee, left_ankle)
-            # logger.debug(f"Frame {frame}: left_knee_angle={left_knee_angle:.2f} degrees")
-
-            if left_knee_angle is not None and left_knee_angle < 160: 
-                partial_scoring['Execute a flat hop to pull the assisting leg under the pelvis.'] = 1
-                partial_eval_frames[2].append(frame)
-      
-        #criterion 3: stiff leg with put down, butt leg is still folded after the flat hop
-        if (right_hip and right_knee and right_ankle and left_knee and left_hip):
-            #assuming right leg is stiff leg
-            right_knee_angle = compute_angle_3pts(right_hip, right_knee, right_ankle)
-            left_knee_angle = compute_angle_3pts(left_hip, left_knee, left_ankle)
-
-
-            if (right_knee_angle is not None and left_knee_angle is not None):
-                if (right_knee_angle > 140 and left_knee_angle < 160):
-                    partial_scoring['Sting leg is down while keeping the butt leg folded after the flat hop'] = 1
-                    partial_eval_frames[3].append(frame)
-                    # logger.debug(f"Frame {frame}: Criterion 3 passed.")
-                
+    logger.debug("PHASE=Transition: Processing %d frames for Criteria 2 & 3.", len(transition_frames))
+
+    #criterion 2: using a flat hop, assisting leg pulled under the pelvis (left leg is assisting leg)
+    assisting_leg_folded = angles['left_knee'] < ASSIST_KNEE_MAX
+    criterion_2 = assisting_leg_folded
+
+    #criterion 3: stiff leg with put down, butt leg is still folded after the flat hop (right leg is stiff leg)
+    criterion_3 = (angles['right_knee'] > STIFF_KNEE_MIN) & assisting_leg_folded
+
+    partial_scoring['Execute a flat hop to pull the assisting leg under the pelvis'] = int(criterion_2.any())
+    partial_scoring['Sting leg is down while keeping the butt leg folded after the flat hop'] = int(criterion_3.any())
+    partial_eval_frames[2] = transition_frames[criterion_2].tolist()
+    partial_eval_frames[3] = transition_frames[criterion_3].tolist()
+
     return partial_scoring, partial_eval_frames
 
-def evaluate_release_phase(release_frames):
+def evaluate_release_phase(release_frames, angles):
     partial_scoring = {
         'Execute a push-out punch, engaging the hip-torso before arm extension': 0,
-        'Keep the ball near the neck until arm extension, pushing at a 45° angle.': 0
+        'Keep the ball near the neck until arm extension, pushing at a 45° angle': 0
     }
     partial_eval_frames = {
         4: [],
         5: []
     }
 
-    # logger.debug(f"PHASE=Release: Processing {len(release_frames)} frames for Criteria 4 & 5.")
-
-    for idx, data in enumerate(release_frames):
-        frame = data.get('frame', idx + len(release_frames))
-        kpts = data['keypoints']
-
-        # logger.debug(f"PHASE=Release Frame={frame}: Checking Criteria 4 & 5...")
+    logger.debug("PHASE=Release: Processing %d frames for Criteria 4 & 5.", len(release_frames))
 
-        left_shoulder = get_keypoint(kpts, 5)
-        right_shoulder = get_keypoint(kpts, 6)
-        left_elbow = get_keypoint(kpts, 7)
-        right_elbow = get_keypoint(kpts, 8)
-        left_wrist = get_keypoint(kpts, 9)
-        right_wrist = get_keypoint(kpts, 10)
-        left_hip = get_keypoint(kpts, 11)
-        right_hip = get_keypoint(kpts, 12)
-        nose = get_keypoint(kpts, 0) 
+    #criterion 4:push out punch, then engage the hip-torso before extending the arm
+    criterion_4 = ((angles['left_elbow'] > PUNCH_ELBOW_MIN) & (angles['right_elbow'] > PUNCH_ELBOW_MIN) &
+                   (np.abs(angles['shoulder_to_hip']) > PUNCH_HIP_MIN))
 
+    #criterion 5:ball remains in neck until arm is extended at release. ball is pushed at a 45° angle
+    criterion_5 = ((angles['wrist_nose_sq_dist'] < RELEASE_DIST_SQ_MAX) &
+                   (angles['arm_release'] >= RELEASE_ANGLE_LO) & (angles['arm_release'] <= RELEASE_ANGLE_HI))
 
-        #criterion 4:push out punch, then engage the hip-torso before extending the arm
-        if (left_shoulder and right_shoulder and left_elbow and right_elbow and
-            left_hip and right_hip):
+    partial_scoring['Execute a push-out punch, engaging the hip-torso before arm extension'] = int(criterion_4.any())
+    partial_scoring['Keep the ball near the neck until arm extension, pushing at a 45° angle'] = int(criterion_5.any())
+    partial_eval_frames[4] = release_frames[criterion_4].tolist()
+    partial_eval_frames[5] = release_frames[criterion_5].tolist()
 
-            left_elbow_angle = compute_angle_3pts(left_shoulder, left_elbow, left_wrist)
-            right_elbow_angle = compute_angle_3pts(right_shoulder, right_elbow, right_wrist)
-            shoulder_to_hip_angle = compute_angle_3pts(left_shoulder, left_hip, right_shoulder)
-
-        
-            #thresholds based on criteria
-            if (left_elbow_angle is not None and right_elbow_angle is not None and
-                shoulder_to_hip_angle is not None):
-
-                #'N/A' if angle is None
-                left_elbow_str = f"{left_elbow_angle:.2f}" if left_elbow_angle is not None else "N/A"
-                right_elbow_str = f"{right_elbow_angle:.2f}" if right_elbow_angle is not None else "N/A"
-                shoulder_to_hip_str = f"{shoulder_to_hip_angle:.2f}" if shoulder_to_hip_angle is not None else "N/A"
-
-                
-
-                if (left_elbow_angle > 160 and right_elbow_angle > 160 and
-                    (shoulder_to_hip_angle > 30 or shoulder_to_hip_angle < -30)): 
-                    partial_scoring['Execute a push-out punch, engaging the hip-torso before arm extension'] = 1
-                    partial_eval_frames[4].append(frame)
-                    # logger.debug(f"Frame {frame}: Criterion 4 passed.")
-               
-
-        #criterion 5:ball remains in neck until arm is extended at release. ball is pushed at a 45° angle
-        if (nose and right_wrist and right_shoulder):
-
-            #ball position
-            dist_wr_nose = distance_2d(right_wrist, nose)
-
-            #arm extension angle (shoulder to wrist)
-            arm_release_angle = None
-            if right_shoulder and right_wrist:
-                dx_arm = right_wrist[0] - right_shoulder[0]
-                dy_arm = right_wrist[1] - right_shoulder[1]
-                arm_release_angle = math.degrees(math.atan2(dy_arm, dx_arm))
-
-            if (dist_wr_nose is not None and arm_release_angle is not None):
-                dist_wr_nose_str = f"{dist_wr_nose:.2f}" if dist_wr_nose is not None else "N/A"
-                arm_release_angle_str = f"{arm_release_angle:.2f}" if arm_release_angle is not None else "N/A"
-
-              
-
-                if (dist_wr_nose < 50 and 30 <= arm_release_angle <= 60):
-                    partial_scoring['Keep the ball near the neck until arm extension, pushing at a 45° angle'] = 1
-                    partial_eval_frames[5].append(frame)
-                    # logger.debug(f"Frame {frame}: Criterion 5 passed.")
-       
     return partial_scoring, partial_eval_frames
 
 # ------------- main evaluation --------------------
 def evaluate_shot_put(player_coords):
-    # logger.info("Starting Shot Put evaluation.")
+    logger.debug("Starting Shot Put evaluation.")
+
+    # 0) gather the keypoints into per-joint arrays and compute every angle once
+    cols = keypoint_columns(player_coords)
+    angles = compute_angle_table(cols)
+    frame_ids = np.fromiter(
+        (data['frame'] for data in player_coords), dtype=np.int32, count=len(player_coords)
+    )
 
     # 1) detect phase transitions
-    preparation_end_index, transition_end_index = detect_phase_transitions(player_coords)
+    wrist_conf = np.fromiter(
+        (data['keypoint_conf'][10] for data in player_coords),
+        dtype=np.float32, count=len(player_coords)
+    )
+    preparation_end_index, transition_end_index = detect_phase_transitions(cols, wrist_conf)
    
     # 2) segment frames by phase
     preparation_frames, transition_frames, release_frames = segment_video_into_phases(
-        player_coords, preparation_end_index, transition_end_index
+        frame_ids, preparation_end_index, transition_end_index
     )
 
     # 3) evaluate each phase
-    preparation_scoring, preparation_eval_frames = evaluate_preparation_phase(preparation_frames)
-    transition_scoring, transition_eval_frames = evaluate_transition_phase(transition_frames)
-    release_scoring, release_eval_frames = evaluate_release_phase(release_frames)
+    preparation_scoring, preparation_eval_frames = evaluate_preparation_phase(
+        preparation_frames, slice_arrays(angles, 0, preparation_end_index)
+    )
+    transition_scoring, transition_eval_frames = evaluate_transition_phase(
+        transition_frames, slice_arrays(angles, preparation_end_index, transition_end_index)
+    )
+    release_scoring, release_eval_frames = evaluate_release_phase(
+        release_frames, slice_arrays(angles, transition_end_index, len(frame_ids))
+    )
 
     # 4) merge results
     scoring = {
@@ -302,7 +256,7 @@ def evaluate_shot_put(player_coords):
     }
 
     # log merged scoring
-    # logger.debug(f"Merged scoring: {scoring}")
+    logger.debug("Merged scoring: %s", scoring)
 
     eval_frames = {
         1: preparation_eval_frames.get(1, []),
@@ -312,5 +266,5 @@ def evaluate_shot_put(player_coords):
         5: release_eval_frames.get(5, [])
     }
 
-    # logger.info("Shot Put evaluation completed.")
+    logger.debug("Shot Put evaluation completed.")
     return scoring, eval_frames
@@ -1,11 +1,31 @@
+import os
+# CPUs this container may run on; os.cpu_count() would report every core of the host
+CPU_COUNT = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+# OpenMP reads this once at import, so it has to be set before torch and cv2 load; an explicit setting wins
+os.environ.setdefault("OMP_NUM_THREADS", str(CPU_COUNT))
+
 import cv2
 import numpy as np
+import torch
 from ultralytics import YOLO
+from ultralytics.trackers.byte_tracker import BYTETracker
+from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.utils.checks import check_yaml
 import streamlit as st
+try:
+    import av
+except ImportError:
+    av = None
 import tempfile
+import hashlib
+import shutil
 import pandas as pd
 import subprocess
-import os
+import atexit
+import importlib.util
+import threading
+import queue
+import logging
 from sprintstart_criteria_checks import evaluate_sprint_start, get_player_coords
 from sprintrunning_criteria_checks import evaluate_sprint_running
 from longjump_criteria_checks import evaluate_long_jump
@@ -15,6 +35,486 @@ from discusthrow_criteria_check import evaluate_discus_throw
 from javelin_criteria_checks import evaluate_javelin_throw
 from hurdling_criteria_checks import evaluate_hurdling
 
+# Downscaling decoded frames runs in OpenCV's own thread pool
+cv2.setNumThreads(CPU_COUNT)
+
+def remove_temp_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+# Frames sent to the pose model per predict call; TensorRT engines are exported for this batch size
+INFERENCE_BATCH = 8
+
+logger = logging.getLogger(__name__)
+
+# Let cuDNN benchmark each new input shape once and keep the fastest convolution algorithms; a video only produces
+# a few shapes (its letterboxed rectangle, e.g. 384x640 for 16:9, at full and last-batch size)
+torch.backends.cudnn.benchmark = True
+
+# Dataset YAML of representative athletics frames used to calibrate an INT8 engine; without it engines are FP16
+CALIBRATION_DATA = "calib.yaml"
+
+# What a failed TensorRT export or torch.compile trace raises: missing or mismatched packages, unsupported ops,
+# bad calibration data, or CUDA and file errors
+ACCELERATION_ERRORS = (RuntimeError, ValueError, AssertionError, ImportError, OSError)
+
+def export_engine(path):
+    # INT8 roughly doubles tensor-core throughput over FP16; fall back to FP16 if calibration is unavailable or fails
+    if os.path.exists(CALIBRATION_DATA):
+        try:
+            return YOLO(path).export(format="engine", imgsz=640, int8=True, data=CALIBRATION_DATA, device=0, dynamic=True, batch=INFERENCE_BATCH)
+        except ACCELERATION_ERRORS:
+            logger.warning("INT8 engine export of %s failed; exporting FP16 instead", path, exc_info=True)
+    return YOLO(path).export(format="engine", imgsz=640, half=True, device=0, dynamic=True, batch=INFERENCE_BATCH)
+
+# Pose weights per quality setting; smaller models trade keypoint accuracy for faster inference
+POSE_MODELS = {
+    "Fast": "yolo11n-pose.pt",
+    "Balanced": "yolo11s-pose.pt",
+    "Accurate": "yolo11m-pose.pt",
+}
+
+@st.cache_resource
+def load_pose_model(path=POSE_MODELS["Accurate"]):
+    # Loaded once per Streamlit process and shared by every upload
+    engine_path = os.path.splitext(path)[0] + ".engine"
+
+    # On GPU hosts with TensorRT, export an INT8 or FP16 engine next to the weights once and reuse it
+    if (not os.path.exists(engine_path) and torch.cuda.is_available()
+            and importlib.util.find_spec("tensorrt") is not None):
+        try:
+            engine_path = export_engine(path)
+        except ACCELERATION_ERRORS:
+            logger.warning("TensorRT engine export of %s failed; running the PyTorch weights", path, exc_info=True)
+
+    if os.path.exists(engine_path):
+        return YOLO(engine_path, task="pose")
+
+    model = YOLO(path)
+
+    # Compiling only pays off on GPU. Each input shape is traced on first use, so warm up full batches of
+    # landscape and portrait 16:9 analysis frames; a shorter last batch still traces its own shape
+    if torch.cuda.is_available() and hasattr(torch, "compile"):
+        try:
+            model.model = torch.compile(model.model, mode="reduce-overhead", fullgraph=False)
+            for frame_width, frame_height in (downscaled_size(16, 9), downscaled_size(9, 16)):
+                predict(model, [np.zeros((frame_height, frame_width, 3), dtype=np.uint8)] * INFERENCE_BATCH)
+        except ACCELERATION_ERRORS:
+            logger.warning("torch.compile of %s failed; running it uncompiled", path, exc_info=True)
+            model = YOLO(path)
+
+    return model
+
+@st.cache_resource
+def pose_model_lock():
+    # The cached model is shared across sessions, but its predictor state is not thread-safe
+    return threading.Lock()
+
+# Sports whose evaluators follow one athlete by track ID; the others score the most confident person per frame
+NEEDS_TRACK = {
+    "Sprint Starting Technique": False,
+    "Sprint Running Technique": True,
+    "Long Jump": True,
+    "High Jump": True,
+    "Discus Throw": False,
+    "Javelin Throw": True,
+    "Shotput": False,
+}
+
+@st.cache_data(max_entries=32)
+def score_sport(sport, player, results_key, _results):
+    # _results is not hashed; results_key stands in for it in the cache key
+    if sport == "Sprint Starting Technique":
+        player_coords = get_player_coords(player, _results)
+        scoring, eval_frames = evaluate_sprint_start(player_coords=player_coords)
+    elif sport == "Sprint Running Technique":
+        player_coords = get_player_coords(player, _results)
+        scoring, eval_frames = evaluate_sprint_running(player_coords=player_coords)
+    elif sport == "Long Jump":
+        player_coords = get_player_coords(player, _results, True, True)
+        scoring, eval_frames = evaluate_long_jump(player_coords=player_coords)
+    elif sport == "High Jump":
+        player_coords = get_player_coords(player, _results, True, True)
+        scoring, eval_frames = evaluate_high_jump(player_coords=player_coords)
+    elif sport == "Shotput":
+        player_coords = get_player_coords(player, _results, True, True)
+        scoring, eval_frames = evaluate_shot_put(player_coords=player_coords)
+    elif sport == "Discus Throw":
+        player_coords = get_player_coords(player, _results, True, True)
+        scoring, eval_frames = evaluate_discus_throw(player_coords=player_coords)
+    elif sport == "Javelin Throw":
+        player_coords = get_player_coords(player, _results)
+        scoring, eval_frames = evaluate_javelin_throw(player_coords=player_coords)
+
+    return scoring, eval_frames
+
+# The pose model gets a copy of each frame with its long side downscaled to the model's 640 input, so the
+# letterbox only pads it; the annotated video is still drawn on the full-resolution frame
+ANALYSIS_MAX_SIZE = 640
+
+# Default analysis rate: None analyzes every frame, since the criteria frame-count thresholds are tuned for
+# full-rate video; a number subsamples higher-fps videos to roughly that many frames per second
+TARGET_FPS = None
+
+def analysis_stride(source_fps, target_fps=TARGET_FPS):
+    # Keep every n-th frame so a 30 or 60 fps video is analyzed at about target_fps
+    if target_fps is None:
+        return 1
+    return max(1, int(source_fps // target_fps))
+
+def downscaled_size(frame_width, frame_height, max_size=ANALYSIS_MAX_SIZE):
+    # (width, height) with the long side at max_size, keeping the aspect ratio
+    scale = max_size / max(frame_width, frame_height)
+    return round(frame_width * scale), round(frame_height * scale)
+
+def analysis_frame(frame, max_size=ANALYSIS_MAX_SIZE):
+    # Downscaled copy of frame for the pose model; frames that already fit are used as they are
+    frame_height, frame_width = frame.shape[:2]
+    if max(frame_width, frame_height) <= max_size:
+        return frame
+    return cv2.resize(frame, downscaled_size(frame_width, frame_height, max_size), interpolation=cv2.INTER_AREA)
+
+def read_frames(video_path, stride=1, backend="OpenCV"):
+    if backend == "PyAV":
+        yield from read_frames_pyav(video_path, stride)
+        return
+
+    # Yield every stride-th frame; grab() advances past the others without converting them to BGR
+    cap = cv2.VideoCapture(video_path)
+    frame_index = 0
+    try:
+        while cap.grab():
+            if frame_index % stride == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                yield frame
+            frame_index += 1
+    finally:
+        cap.release()
+
+def read_frames_pyav(video_path, stride=1):
+    # FFmpeg decodes with its own frame/slice threads; only kept frames are converted to BGR
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        for frame_index, frame in enumerate(container.decode(stream)):
+            if frame_index % stride == 0:
+                yield frame.to_ndarray(format="bgr24")
+
+# Frames buffered between the decode, inference and annotation stages
+PREFETCH_FRAMES = 8
+# How often a stage blocked on a queue checks whether the pipeline was stopped
+QUEUE_POLL_SECONDS = 0.1
+
+def put_until_stopped(q, item, stop):
+    # Blocking put that gives up once another stage has failed, so a full queue can never deadlock the pipeline
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def get_until_stopped(q, stop):
+    # Blocking get that returns the None sentinel once the pipeline has been stopped
+    while not stop.is_set():
+        try:
+            return q.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            pass
+    return None
+
+def decode_frames(video_path, stride, backend, read_q, stop, errors, max_size=ANALYSIS_MAX_SIZE):
+    # Reader stage: decode (frame, analysis copy) pairs into read_q, then a None sentinel; a failure is handed to
+    # the inference thread
+    try:
+        for frame in read_frames(video_path, stride, backend):
+            if not put_until_stopped(read_q, (frame, analysis_frame(frame, max_size)), stop):
+                return
+    except BaseException as error:
+        errors.append(error)
+        stop.set()
+    finally:
+        put_until_stopped(read_q, None, stop)
+
+@st.cache_resource
+def h264_encoder():
+    # NVENC offloads encoding to the GPU; probe it once with a tiny clip, since ffmpeg can list it without a usable GPU
+    try:
+        probe = subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+             "-c:v", "h264_nvenc", "-f", "null", "-"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30
+        )
+        if probe.returncode == 0:
+            return "h264_nvenc"
+        logger.info("h264_nvenc is unavailable (ffmpeg exited with %d); encoding with libx264", probe.returncode)
+    except (OSError, subprocess.TimeoutExpired):
+        logger.warning("Probing h264_nvenc failed; encoding with libx264", exc_info=True)
+    return "libx264"
+
+class EncodingError(RuntimeError):
+    # ffmpeg exited with an error while encoding the annotated video; encoder names the codec that failed
+    def __init__(self, encoder, returncode):
+        super().__init__(f"Failed to encode the annotated video with {encoder} (ffmpeg exited with {returncode}).")
+        self.encoder = encoder
+
+def open_h264_writer(output_path, fps, frame_size, encoder):
+    # Raw BGR frames are piped straight into the H.264 encoder, so the video is encoded once in a browser-playable format
+    frame_width, frame_height = frame_size
+    return subprocess.Popen(
+        ["ffmpeg", "-y", "-loglevel", "error",
+         "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{frame_width}x{frame_height}", "-r", str(fps), "-i", "-",
+         "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2", "-c:v", encoder, "-pix_fmt", "yuv420p",
+         # Moov atom up front so st.video can start playing before the whole file has been sent
+         "-movflags", "+faststart", output_path],
+        stdin=subprocess.PIPE
+    )
+
+# COCO keypoint pairs joined when drawing the pose overlay
+SKELETON = (
+    (15, 13), (13, 11), (16, 14), (14, 12), (11, 12), (5, 11), (6, 12), (5, 6),
+    (5, 7), (6, 8), (7, 9), (8, 10), (1, 2), (0, 1), (0, 2), (1, 3), (2, 4), (3, 5), (4, 6)
+)
+SKELETON_INDEX = np.array(SKELETON)
+# Overlay styling (BGR), shared by every frame
+BOX_COLOR = (56, 56, 255)
+SKELETON_COLOR = (255, 128, 0)
+KEYPOINT_COLOR = (0, 255, 0)
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+def slim_result(frame_index, result, box_scale=1.0):
+    # Keep only small CPU numpy arrays per frame; the Results object holds device tensors and the analysis image
+    # Boxes are scaled back to source-video pixels, which the box-based criteria thresholds are tuned for
+    boxes = result.boxes
+    keypoints = result.keypoints
+    if len(boxes) == 0:
+        # Nobody detected (common at the start and end of a clip): skip the device-to-host copies
+        return {
+            'frame': frame_index,
+            'keypoints': np.empty((0, 17, 2), dtype=np.float32),
+            'keypoint_conf': np.empty((0, 17), dtype=np.float32),
+            'boxes': np.empty((0, 4), dtype=np.float32),
+            'ids': None,
+            'conf': np.empty(0, dtype=np.float32)
+        }
+    return {
+        'frame': frame_index,
+        'keypoints': keypoints.xyn.cpu().numpy() if keypoints is not None else np.empty((0, 17, 2), dtype=np.float32),
+        # Per-keypoint confidences let the evaluators pick the body side facing the camera
+        'keypoint_conf': keypoints.conf.cpu().numpy() if keypoints is not None and keypoints.conf is not None
+                         else np.ones((len(boxes), 17), dtype=np.float32),
+        'boxes': boxes.xyxy.cpu().numpy() * box_scale,
+        'ids': boxes.id.cpu().numpy() if boxes.id is not None else None,
+        'conf': boxes.conf.cpu().numpy()
+    }
+
+def draw_pose(frame, pose):
+    # Lightweight stand-in for Results.plot(): boxes with track IDs, skeleton and keypoints, drawn on the
+    # source-resolution frame (boxes are in source pixels, keypoints are normalized)
+    frame_height, frame_width = frame.shape[:2]
+    ids = pose['ids'] if pose['ids'] is not None else [None] * len(pose['boxes'])
+    for box, kpts, track_id in zip(pose['boxes'], pose['keypoints'], ids):
+        x1, y1, x2, y2 = map(int, box)
+        cv2.rectangle(frame, (x1, y1), (x2, y2), BOX_COLOR, 2)
+        if track_id is not None:
+            cv2.putText(frame, f"id:{int(track_id)}", (x1, max(y1 - 6, 12)), LABEL_FONT, 0.6, BOX_COLOR, 2)
+
+        # Keypoints below the confidence threshold come back as (0, 0)
+        points = (kpts * (frame_width, frame_height)).astype(np.int32)
+        visible = (kpts > 0).all(axis=1)
+        # All skeleton segments with both ends visible, drawn in one polylines call
+        segments = points[SKELETON_INDEX[visible[SKELETON_INDEX].all(axis=1)]]
+        if len(segments):
+            cv2.polylines(frame, list(segments), False, SKELETON_COLOR, 2)
+        for point in points[visible].tolist():
+            cv2.circle(frame, tuple(point), 4, KEYPOINT_COLOR, -1)
+    return frame
+
+def write_annotated_video(write_q, output_path, fps, stop, errors, encoder="libx264"):
+    # Writer stage: draw each (frame, pose) pair from write_q and encode it until the None sentinel or a stop;
+    # an ffmpeg failure is recorded as an EncodingError once the queue is drained
+    out = None
+    try:
+        while (item := get_until_stopped(write_q, stop)) is not None:
+            frame, pose = item
+            # Frames without detections go straight to the encoder
+            annotated_frame = draw_pose(frame, pose) if len(pose['boxes']) else frame
+            if out is None:
+                frame_height, frame_width, _ = annotated_frame.shape
+                out = open_h264_writer(output_path, fps, (frame_width, frame_height), encoder)
+            # Keep draining the queue even if ffmpeg exited, so inference never blocks
+            if out.poll() is None:
+                try:
+                    # Hand ffmpeg the frame's own buffer; tobytes() would copy every frame once more
+                    out.stdin.write(np.ascontiguousarray(annotated_frame).data)
+                except BrokenPipeError:
+                    pass
+    except BaseException as error:
+        errors.append(error)
+        stop.set()
+    finally:
+        if out is not None:
+            try:
+                out.stdin.close()
+            except BrokenPipeError:
+                pass
+            if out.wait() != 0:
+                errors.append(EncodingError(encoder, out.returncode))
+
+def render_annotated_video(video_path, stride, decoder, results, output_path, fps, encoder="libx264", on_progress=None):
+    # Re-decode the frames and draw already computed poses, without inference: used for cached results and
+    # as the fallback pass after the first encoder failed
+    write_q = queue.Queue(maxsize=PREFETCH_FRAMES)
+    stop = threading.Event()
+    errors = []
+    writer = threading.Thread(target=write_annotated_video, args=(write_q, output_path, fps, stop, errors, encoder), daemon=True)
+    writer.start()
+    try:
+        for done, (frame, pose) in enumerate(zip(read_frames(video_path, stride, decoder), results), 1):
+            if not put_until_stopped(write_q, (frame, pose), stop):
+                break
+            if on_progress is not None:
+                on_progress(done, len(results))
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        put_until_stopped(write_q, None, stop)
+        writer.join()
+    if len(errors) == 1 and isinstance(errors[0], EncodingError) and encoder != "libx264":
+        logger.warning("Encoding with %s failed; re-encoding with libx264", encoder, exc_info=errors[0])
+        render_annotated_video(video_path, stride, decoder, results, output_path, fps, "libx264", on_progress)
+    elif errors:
+        raise errors[0]
+
+def new_tracker(frame_rate):
+    # Standalone ByteTrack with the same settings model.track() uses, so detection can run batched
+    cfg = IterableSimpleNamespace(**yaml_load(check_yaml("bytetrack.yaml")))
+    return BYTETracker(args=cfg, frame_rate=max(1, round(frame_rate)))
+
+def track_result(tracker, result):
+    # Assign track IDs to one frame's detections, mirroring ultralytics' own track callback: frames without
+    # detections skip the tracker, as they do under model.track()
+    if len(result.boxes) == 0:
+        return result
+    tracks = tracker.update(result.boxes.cpu().numpy(), result.orig_img)
+    if len(tracks) == 0:
+        return result
+    result = result[tracks[:, -1].astype(int)]
+    result.update(boxes=torch.as_tensor(tracks[:, :-1]))
+    return result
+
+def predict(model, frames):
+    # Grad mode is thread-local and each Streamlit session runs in its own thread, so disable autograd per call
+    with torch.inference_mode():
+        return model.predict(frames, verbose=False)
+
+def predict_batches(model, read_q, stop):
+    # Group the analysis copies from read_q into batches of INFERENCE_BATCH and yield (source frame, result)
+    # pairs in frame order
+    batch = []
+    while (item := get_until_stopped(read_q, stop)) is not None:
+        batch.append(item)
+        if len(batch) == INFERENCE_BATCH:
+            yield from predict_pairs(model, batch)
+            batch = []
+    if batch:
+        yield from predict_pairs(model, batch)
+
+def predict_pairs(model, batch):
+    # Run the pose model on the analysis copies and pair each result with its source frame
+    frames, analysis_frames = zip(*batch)
+    return zip(frames, predict(model, list(analysis_frames)))
+
+def video_timing(video_path, stride):
+    # Analyzed frame rate and the factor that maps boxes on the downscaled analysis frames back to source pixels
+    capture = cv2.VideoCapture(video_path)
+    fps = (capture.get(cv2.CAP_PROP_FPS) or 30) / stride
+    source_size = max(capture.get(cv2.CAP_PROP_FRAME_WIDTH), capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    capture.release()
+    return fps, max(1.0, source_size / ANALYSIS_MAX_SIZE)
+
+def annotated_video_path(video_hash, stride, weights, track):
+    # One annotated video per set of results, next to the other temp files
+    name = f"athlete-assist-{video_hash[:16]}-{stride}-{os.path.splitext(weights)[0]}-{int(track)}.mp4"
+    return os.path.join(tempfile.gettempdir(), name)
+
+# Bump whenever the per-frame result format changes, so results persisted by older code are recomputed
+RESULTS_VERSION = 1
+
+@st.cache_data(persist="disk", max_entries=16, show_spinner="Running pose estimation...")
+def pose_results(video_hash, stride, weights, track, results_version, _video_path, _decoder="OpenCV"):
+    # Keyed by the video's SHA-256 rather than its temp path, so re-uploading an already processed video skips
+    # inference; only the slim per-frame results are persisted. The annotated video drawn along the way is
+    # left at annotated_video_path() and rendered again from these results if it is gone
+    return run_pose(weights, stride, track, _video_path, annotated_video_path(video_hash, stride, weights, track), _decoder)
+
+def run_pose(weights, stride, track, video_path, annotated_path, decoder="OpenCV"):
+    # Returns the slim per-frame results and writes the annotated video to annotated_path
+    model = load_pose_model(weights)
+    fps, box_scale = video_timing(video_path, stride)
+
+    # Encode into a temp file first, so annotated_path never holds a partial video
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as output_video:
+        output_video_path = output_video.name
+
+    try:
+        # Decode, inference and annotation overlap: a reader thread fills read_q, this thread runs batched YOLO
+        # and, if needed, tracks the detections frame by frame, and a writer thread draws and encodes the annotated video from write_q
+        # Any stage that fails sets stop and records its exception, which unblocks the others and is re-raised here
+        read_q = queue.Queue(maxsize=PREFETCH_FRAMES)
+        write_q = queue.Queue(maxsize=PREFETCH_FRAMES)
+        stop = threading.Event()
+        errors = []
+        encoder = h264_encoder()
+        reader = threading.Thread(target=decode_frames, args=(video_path, stride, decoder, read_q, stop, errors), daemon=True)
+        writer = threading.Thread(target=write_annotated_video, args=(write_q, output_video_path, fps, stop, errors, encoder), daemon=True)
+        reader.start()
+        writer.start()
+
+        try:
+            tracker = new_tracker(fps) if track else None
+            results = []
+            with pose_model_lock():
+                for frame, result in predict_batches(model, read_q, stop):
+                    if tracker is not None:
+                        result = track_result(tracker, result)
+                    # Frames are numbered by their index in the source video, so subsampled results keep real frame ids
+                    pose = slim_result(len(results) * stride, result, box_scale)
+                    results.append(pose)
+                    # Only the source frame and the slim pose go on; the Results object is dropped here
+                    if not put_until_stopped(write_q, (frame, pose), stop):
+                        break
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            put_until_stopped(write_q, None, stop)
+            reader.join()
+            writer.join()
+        # NVENC can pass the probe and still fail mid-video (e.g. when the GPU runs out of encoder sessions),
+        # so an encoder failure alone gets one more pass with libx264 from the poses already computed
+        if len(errors) == 1 and isinstance(errors[0], EncodingError) and encoder != "libx264":
+            logger.warning("Encoding with %s failed; re-encoding with libx264", encoder, exc_info=errors[0])
+            encoder = "libx264"
+            render_annotated_video(video_path, stride, decoder, results, output_video_path, fps, encoder)
+        elif errors:
+            raise errors[0]
+
+        if os.path.getsize(output_video_path) == 0:
+            raise RuntimeError(f"Failed to encode the annotated video with {encoder}. Check that ffmpeg with {encoder} is installed.")
+
+        os.replace(output_video_path, annotated_path)
+        atexit.register(remove_temp_file, annotated_path)
+        return results
+    finally:
+        remove_temp_file(output_video_path)
+
 # Set page config
 st.set_page_config("Athlete Assist", layout="wide")
 
@@ -42,96 +542,92 @@ sport = st.sidebar.selectbox(
     ("Sprint Starting Technique", "Sprint Running Technique", "Long Jump", "High Jump", 'Discus Throw','Javelin Throw','Shotput'),
 )
 
+target_fps = st.sidebar.select_slider("**Frames analyzed per second**", options=(5, 10, 15, 30, 60, None), value=TARGET_FPS,
+                                      format_func=lambda fps: "All" if fps is None else fps)
+if target_fps is not None:
+    st.sidebar.warning("Scores are approximate when frames are skipped; the criteria are tuned for every frame.")
+quality = st.sidebar.selectbox("**Pose model quality**", tuple(POSE_MODELS), index=len(POSE_MODELS) - 1)
+# PyAV is optional; without it frames are always decoded with OpenCV
+decoder = st.sidebar.selectbox("**Video decoder**", ("OpenCV", "PyAV")) if av is not None else "OpenCV"
+
 st.write(f"**You selected:** {sport}")
 uploaded_file = st.sidebar.file_uploader("**Choose a video...**", type=["mp4", "avi", "mov"], on_change=st.session_state.clear)
 
 vid_col1, vid_col2 = st.columns(2)
 
 if uploaded_file is not None:
-    if "uploaded_file_path" not in st.session_state or st.session_state.uploaded_file_path != uploaded_file.name:
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_video:
-            temp_video.write(uploaded_file.read())
-            st.session_state.uploaded_file_path = temp_video.name
-
-
-    if "results" not in st.session_state:
-        model = YOLO("yolo11m-pose.pt")
-        total_frames = cv2.VideoCapture(st.session_state.uploaded_file_path).get(cv2.CAP_PROP_FRAME_COUNT)
-        progress_bar = st.progress(0, text="Processing frame 0 of {}".format(int(total_frames)))  # Initialize progress bar
-        
-        
-        results = []
-        for i, result in enumerate(model.track(source=st.session_state.uploaded_file_path, stream=True)):
-            results.append(result)
-            progress_bar.progress(
-                min((i + 1) / total_frames, 1.0),  # Ensure progress doesn't exceed 100%
-                text="Processing frame {} of {}".format(i + 1, int(total_frames))  # Update frame number
-            )
+    # session state is cleared on every new upload, so this only runs once per video
+    if "uploaded_file_path" not in st.session_state:
+        temp_video = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
+        try:
+            # Stream the upload to disk in 1 MB chunks instead of materializing it as one buffer
+            with temp_video:
+                uploaded_file.seek(0)
+                shutil.copyfileobj(uploaded_file, temp_video, length=1 << 20)
+        except BaseException:
+            remove_temp_file(temp_video.name)
+            raise
+        st.session_state.uploaded_file_path = temp_video.name
+        st.session_state.video_hash = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()
+        capture = cv2.VideoCapture(temp_video.name)
+        st.session_state.source_fps = capture.get(cv2.CAP_PROP_FPS) or 30
+        capture.release()
+        atexit.register(remove_temp_file, temp_video.name)
 
-        st.session_state.results = results
-        progress_bar.empty()
-
-        st.success("Video processing complete!", icon="🎉")
-    
-
-        
-
-    output_video_path = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4").name
-    st.session_state.output_video_path = output_video_path
 
-    fps = 30
-    fourcc = cv2.VideoWriter_fourcc(*"mp4v") 
-    
-    first_frame = st.session_state.results[0].plot()
-    frame_height, frame_width, _ = first_frame.shape
-    frame_size = (frame_width, frame_height)
-
-    out = cv2.VideoWriter(output_video_path, fourcc, fps, frame_size)
-    if not out.isOpened():
-        raise RuntimeError("Failed to initialize VideoWriter. Check codec compatibility.")
-    for result in st.session_state.results:
-        annotated_frame = result.plot()
-        out.write(annotated_frame)
-    out.release()
+    # Re-run inference for a new upload, a changed frame stride or model, or a sport that needs track IDs the
+    # results lack; tracked results also serve the sports that don't need them
+    track = NEEDS_TRACK[sport]
+    stride = analysis_stride(st.session_state.source_fps, target_fps)
+    results_key = (st.session_state.video_hash, stride, POSE_MODELS[quality], track)
+    previous_key = st.session_state.get("results_key")
+    if previous_key is None or previous_key[:3] != results_key[:3] or (track and not previous_key[3]):
+        results = pose_results(*results_key, RESULTS_VERSION, st.session_state.uploaded_file_path, decoder)
+        annotated_video = annotated_video_path(*results_key)
+        # Results served from the disk cache can outlive their annotated video; draw it again without inference
+        if not os.path.exists(annotated_video):
+            progress_bar = st.progress(0, text="Drawing the annotated video...")  # Initialize progress bar
+            fps, _ = video_timing(st.session_state.uploaded_file_path, stride)
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as output_video:
+                output_video_path = output_video.name
+            try:
+                render_annotated_video(
+                    st.session_state.uploaded_file_path, stride, decoder, results, output_video_path, fps, h264_encoder(),
+                    lambda done, total: progress_bar.progress(
+                        min(done / total, 1.0),  # Ensure progress doesn't exceed 100%
+                        text="Drawing frame {} of {}".format(done, total)  # Update frame number
+                    )
+                )
+                os.replace(output_video_path, annotated_video)
+            finally:
+                remove_temp_file(output_video_path)
+            atexit.register(remove_temp_file, annotated_video)
+            progress_bar.empty()
 
-    convertedVideo = "./testh264.mp4"
-    subprocess.call(f"ffmpeg -y -i {output_video_path} -c:v libx264 {convertedVideo}".split(" "))
+        st.session_state.results = results
+        st.session_state.annotated_video = annotated_video
+        st.session_state.results_key = results_key
 
+        st.success("Video processing complete!", icon="🎉")
 
     with vid_col1:
         st.video(st.session_state.uploaded_file_path)
 
     with vid_col2:
-        st.video(convertedVideo, format="video/mp4")
+        st.video(st.session_state.annotated_video, format="video/mp4")
 
 if "results" in st.session_state:
     results_col1, results_col2 = st.columns(2)
     results = st.session_state.results
     with results_col1:
-        player = st.number_input("Enter the player ID", min_value=0, max_value=100, value=0)
+        if NEEDS_TRACK[sport]:
+            player = st.number_input("Enter the player ID", min_value=0, max_value=100, value=0)
+        else:
+            player = None
+            st.caption("Scoring the most confident athlete in each frame.")
 
-    if sport == "Sprint Starting Technique":
-        player_coords = get_player_coords(player, results)
-        scoring, eval_frames = evaluate_sprint_start(player_coords=player_coords)
-    elif sport == "Sprint Running Technique":
-        player_coords = get_player_coords(player, results)
-        scoring, eval_frames = evaluate_sprint_running(player_coords=player_coords)
-    elif sport == "Long Jump":
-        player_coords = get_player_coords(player, results, True, True)
-        scoring, eval_frames = evaluate_long_jump(player_coords=player_coords)
-    elif sport == "High Jump":
-        player_coords = get_player_coords(player, results, True, True)
-        scoring, eval_frames = evaluate_high_jump(player_coords=player_coords)
-    elif sport == "Shotput":
-        player_coords = get_player_coords(player, results, True, True)
-        scoring, eval_frames = evaluate_shot_put(player_coords=player_coords)
-    elif sport == "Discus Throw":
-        player_coords = get_player_coords(player, results, True, True)
-        scoring, eval_frames = evaluate_discus_throw(player_coords=player_coords)
-    elif sport == "Javelin Throw":
-        player_coords = get_player_coords(player, results)
-        scoring, eval_frames = evaluate_javelin_throw(player_coords=player_coords)
+    # The video's hash, the stride, the pose model and whether it was tracked identify the results
+    scoring, eval_frames = score_sport(sport, player, st.session_state.results_key, results)
 
     scoring_df = pd.DataFrame(list(scoring.items()), columns=['Criteria', 'Score'])
     
@@ -1,49 +1,37 @@
-import math
 import logging
+import numpy as np
 
 # ------------- helper geometry functions --------------------
-def get_keypoint(kpts, idx):
-
-    if idx < len(kpts):
-        return kpts[idx]
-    return None
-
-def distance_2d(p1, p2):
-    if p1 is None or p2 is None:
-        return None
-    return math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-
-def compute_angle_3pts(a, b, c):
-
-    if a is None or b is None or c is None:
-        return None
-    ax, ay = a[0], a[1]
-    bx, by = b[0], b[1]
-    cx, cy = c[0], c[1]
-    v1 = (ax - bx, ay - by)
-    v2 = (cx - bx, cy - by)
-    mag1 = math.hypot(v1[0], v1[1])
-    mag2 = math.hypot(v2[0], v2[1])
-    if mag1 < 1e-5 or mag2 < 1e-5:
-        return None
-    dot = v1[0] * v2[0] + v1[1] * v2[1]
-    cos_angle = max(-1.0, min(1.0, dot / (mag1 * mag2)))
-    try:
-        angle_rad = math.acos(cos_angle)
-        angle_deg = math.degrees(angle_rad)
-        return angle_deg
-    except ValueError:
-        # logger.debug(f"Invalid angle calculation with cos_angle={cos_angle}")
-        return None
+NUM_KEYPOINTS = 17
+
+def keypoint_array(player_coords):
+    #stack every frame's keypoints into one (F, 17, 2) array, NaN where a keypoint is missing
+    kpts = np.full((len(player_coords), NUM_KEYPOINTS, 2), np.nan)
+    for i, data in enumerate(player_coords):
+        frame_kpts = np.asarray(data['keypoints'], dtype=np.float64).reshape(-1, 2)[:NUM_KEYPOINTS]
+        kpts[i, :len(frame_kpts)] = frame_kpts
+    return kpts
+
+def compute_angles_3pts(a, b, c):
+    #angle at b for every frame at once, NaN where the angle is undefined
+    v1 = a - b
+    v2 = c - b
+    mag1 = np.hypot(v1[..., 0], v1[..., 1])
+    mag2 = np.hypot(v2[..., 0], v2[..., 1])
+    dot = (v1 * v2).sum(axis=-1)
+    cross = v1[..., 0] * v2[..., 1] - v1[..., 1] * v2[..., 0]
+    angles = np.degrees(np.arctan2(np.abs(cross), dot))
+    angles[(mag1 < 1e-5) | (mag2 < 1e-5)] = np.nan
+    return angles
 
 
 # ------------- phase detection and segmentation --------------------
-def detect_phase_transitions(player_coords):
-    if not player_coords:
+def detect_phase_transitions(kpts):
+    total = len(kpts)
+    if total == 0:
         # logger.debug("player_coords is empty.")
         return 0, 0
 
-    total = len(player_coords)
     one_third = total // 3
     two_thirds = (2 * total) // 3
 
@@ -55,18 +43,18 @@ def detect_phase_transitions(player_coords):
 
     return swing_end_index, turn_end_index
 
-def segment_video_into_phases(player_coords, swing_end_index, turn_end_index):
+def segment_video_into_phases(frame_ids, kpts, swing_end_index, turn_end_index):
+    #each phase is a (frame ids, keypoints) pair of array views
+    swing_phase = (frame_ids[:swing_end_index], kpts[:swing_end_index])
+    turn_phase = (frame_ids[swing_end_index:turn_end_index], kpts[swing_end_index:turn_end_index])
+    throw_phase = (frame_ids[turn_end_index:], kpts[turn_end_index:])
 
-    swing_phase_frames = player_coords[:swing_end_index]
-    turn_phase_frames = player_coords[swing_end_index:turn_end_index]
-    throw_phase_frames = player_coords[turn_end_index:]
+    # logger.debug(f"Segments: swing_frames={len(swing_phase[0])}, turn_frames={len(turn_phase[0])}, throw_frames={len(throw_phase[0])}")
 
-    # logger.debug(f"Segments: swing_frames={len(swing_phase_frames)}, turn_frames={len(turn_phase_frames)}, throw_frames={len(throw_phase_frames)}")
-
-    return swing_phase_frames, turn_phase_frames, throw_phase_frames
+    return swing_phase, turn_phase, throw_phase
 
 # ------------- criterion checks by phase --------------------
-def evaluate_swing_phase(swing_frames, pass_threshold=0.7):
+def evaluate_swing_phase(swing_phase, pass_threshold=0.7):
     partial_scoring = {
         'intro_swing_behind': 0
     }
@@ -74,40 +62,26 @@ def evaluate_swing_phase(swing_frames, pass_threshold=0.7):
         1: []
     }
 
-    # logger.debug(f"PHASE=Swing: Processing {len(swing_frames)} frames for Criterion 1.")
-
-    passing_frames = 0
-
-    for idx, data in enumerate(swing_frames):
-        frame = data.get('frame', idx) 
-        kpts = data['keypoints']
+    frames, kpts = swing_phase
+    # logger.debug(f"PHASE=Swing: Processing {len(frames)} frames for Criterion 1.")
 
-        # logger.debug(f"PHASE=Swing Frame={frame}: Checking Criterion 1...")
+    right_shoulder = kpts[:, 6]
+    right_hip = kpts[:, 12]
+    right_wrist = kpts[:, 10]
 
-        right_shoulder = get_keypoint(kpts, 6)
-        right_hip = get_keypoint(kpts, 12)
-        right_wrist = get_keypoint(kpts, 10)
+    #criterion 1: introductory swing behind
+    swing_angle = compute_angles_3pts(right_wrist, right_shoulder, right_hip)
+    passing = (swing_angle > 160) & (right_wrist[:, 0] < right_shoulder[:, 0])
+    partial_eval_frames[1] = frames[passing].tolist()
 
-        # logger.debug(f"Frame {frame}: right_shoulder={right_shoulder}, right_hip={right_hip}, right_wrist={right_wrist}")
-
-        #criterion 1: introductory swing behind
-        if right_wrist and right_shoulder and right_hip:
-            swing_angle_calc = compute_angle_3pts(right_wrist, right_shoulder, right_hip)
-             
-            #check if the swing angle and wrist position meet the criteria
-            if swing_angle_calc > 160 and right_wrist[0] < right_shoulder[0]:
-                passing_frames += 1
-                partial_eval_frames[1].append(frame)
-                # logger.debug(f"Frame {frame}: Criterion 1 passed.")
-            
     #calculate the percentage of passing frames
-    total_frames = len(swing_frames)
+    total_frames = len(frames)
     if total_frames == 0:
         # logger.debug("No frames to evaluate in Swing phase.")
         return partial_scoring, partial_eval_frames
 
-    pass_percentage = passing_frames / total_frames
-    # logger.debug(f"Swing Phase: {passing_frames} out of {total_frames} frames passed Criterion 1 (Pass Percentage: {pass_percentage:.2%})")
+    pass_percentage = np.count_nonzero(passing) / total_frames
+    # logger.debug(f"Swing Phase: {np.count_nonzero(passing)} out of {total_frames} frames passed Criterion 1 (Pass Percentage: {pass_percentage:.2%})")
 
     #determine if the pass percentage meets the threshold
     if pass_percentage >= pass_threshold:
@@ -117,7 +91,7 @@ def evaluate_swing_phase(swing_frames, pass_threshold=0.7):
 
 
 
-def evaluate_turn_phase(turn_frames):
+def evaluate_turn_phase(turn_phase):
     partial_scoring = {
         'jump_turn_initiated': 0,     
         'jump_turn_center_circle': 1 
@@ -127,66 +101,41 @@ def evaluate_turn_phase(turn_frames):
         3: []   
     }
 
-    # logger.debug(f"PHASE=Turn: Processing {len(turn_frames)} frames for Criteria 2 & 3.")
+    frames, kpts = turn_phase
+    # logger.debug(f"PHASE=Turn: Processing {len(frames)} frames for Criteria 2 & 3.")
 
     #criterion 3 parameters
     circle_center_x = 0.42
     threshold_distance = 0.05
 
-    #flag tracking criterion 3
-    criterion_3_failed = False
-
-    for idx, data in enumerate(turn_frames):
-        frame = data.get('frame', idx + len(turn_frames)) 
-        jump_angle = data.get('jump_angle')       #jump_angle is available
-        mid_ankle_x = data.get('mid_ankle_x')   
-        kpts = data.get('keypoints', {})
-
-        # logger.debug(f"PHASE=Turn Frame={frame}: checking Criteria 2 & 3...")
-        # logger.debug(f"Frame {frame}: jump_angle={jump_angle}")
-        # logger.debug(f"Frame {frame}: mid_ankle_x={mid_ankle_x}")
-
-        right_hip = get_keypoint(kpts, 12)
-        right_knee = get_keypoint(kpts, 14)
-        right_ankle = get_keypoint(kpts, 16)
-        left_ankle = get_keypoint(kpts, 15)
-
-        #jump angle
-        jump_angle_calc = compute_angle_3pts(right_hip, right_knee, right_ankle)
-        # logger.debug(f"Frame {frame}: computed jump_angle={jump_angle_calc}")
-
-        # --- criterion 2: jump turn initiated ---
-        if right_ankle and right_knee and right_hip:
-            if jump_angle_calc is None:
-                continue
-            else:
-                if jump_angle_calc > 80: 
-                    partial_scoring['jump_turn_initiated'] = 1
-                    partial_eval_frames[2].append(frame)
-               
-        # --- criterion 3: jump turn near Center of circle ---
-        if right_ankle and left_ankle:
-            computed_mid_ankle_x = (right_ankle[0] + left_ankle[0]) / 2
-            # logger.debug(f"Frame {frame}: computed mid_ankle_x={computed_mid_ankle_x}")
-
-            if abs(computed_mid_ankle_x - circle_center_x) < threshold_distance:
-                partial_eval_frames[3].append(frame)
-                # logger.debug(f"Frame {frame}: criterion 3 satisfied: mid_ankle_x={computed_mid_ankle_x}")
-            else:
-                criterion_3_failed = True
-                # logger.debug(f"Frame {frame}: criterion 3 failed: mid_ankle_x={computed_mid_ankle_x}")
-        else:
-           
-            criterion_3_failed = True
-            # logger.debug(f"Frame {frame}: missing keypoints for Criterion 3 evaluation.")
-
-    if criterion_3_failed:
+    right_hip = kpts[:, 12]
+    right_knee = kpts[:, 14]
+    right_ankle = kpts[:, 16]
+    left_ankle = kpts[:, 15]
+
+    #jump angle, frames where it is undefined are skipped for both criteria
+    jump_angle = compute_angles_3pts(right_hip, right_knee, right_ankle)
+    evaluated = ~np.isnan(jump_angle)
+
+    # --- criterion 2: jump turn initiated ---
+    turn_initiated = jump_angle > 80
+    if turn_initiated.any():
+        partial_scoring['jump_turn_initiated'] = 1
+    partial_eval_frames[2] = frames[turn_initiated].tolist()
+
+    # --- criterion 3: jump turn near Center of circle ---
+    #a missing ankle gives a NaN midpoint, which counts as a miss
+    mid_ankle_x = (right_ankle[:, 0] + left_ankle[:, 0]) / 2
+    near_center = evaluated & (np.abs(mid_ankle_x - circle_center_x) < threshold_distance)
+    partial_eval_frames[3] = frames[near_center].tolist()
+
+    if (evaluated & ~near_center).any():
         partial_scoring['jump_turn_center_circle'] = 0
    
     return partial_scoring, partial_eval_frames
 
 
-def evaluate_throw_phase(throw_frames):
+def evaluate_throw_phase(throw_phase):
     partial_scoring = {
         'throw_off_low_to_high': 0,
         'discus_release_via_wrist': 0
@@ -196,61 +145,50 @@ def evaluate_throw_phase(throw_frames):
         5: []
     }
 
-    # logger.debug(f"PHASE=Throw: Processing {len(throw_frames)} frames for Criteria 4 & 5.")
-
-    for idx, data in enumerate(throw_frames):
-        frame = data.get('frame', idx + len(throw_frames))
-        kpts = data['keypoints']
-
-        # logger.debug(f"PHASE=Throw Frame={frame}: Checking Criteria 4 & 5...")
-
-        right_knee = get_keypoint(kpts, 14)
-        right_hip = get_keypoint(kpts, 12)
-        left_knee = get_keypoint(kpts, 13)
-        right_shoulder = get_keypoint(kpts, 6)
-        right_wrist = get_keypoint(kpts, 10)
-
-        #compute angles debug only
-        throw_angle = compute_angle_3pts(right_knee, right_hip, left_knee)
-        release_angle = compute_angle_3pts(right_shoulder, right_wrist, (right_wrist[0] + 1, right_wrist[1]))
-
-        #debug log
-        # logger.debug(f"Frame {frame}: throw_angle={throw_angle}, release_angle={release_angle}")
-
-        #criterion 4: throw-off from low to high
-        if right_hip and right_knee and left_knee:
-            throw_angle_calc = compute_angle_3pts(right_knee, right_hip, left_knee)
-           
-            if throw_angle_calc > 45:
-                partial_scoring['throw_off_low_to_high'] = 1
-                partial_eval_frames[4].append(frame)
-
-
-        #criterion 5: discus release via wrist
-        if right_shoulder and right_wrist:
-            #using a mock point (right_wrist[0] + 1, right_wrist[1]) for direction
-            release_angle_calc = compute_angle_3pts(
-                right_shoulder, 
-                right_wrist, 
-                (right_wrist[0] + 1, right_wrist[1])
-            )
-    
-            if release_angle_calc > 30: 
-                partial_scoring['discus_release_via_wrist'] = 1
-                partial_eval_frames[5].append(frame)
+    frames, kpts = throw_phase
+    # logger.debug(f"PHASE=Throw: Processing {len(frames)} frames for Criteria 4 & 5.")
+
+    right_knee = kpts[:, 14]
+    right_hip = kpts[:, 12]
+    left_knee = kpts[:, 13]
+    right_shoulder = kpts[:, 6]
+    right_wrist = kpts[:, 10]
+
+    #criterion 4: throw-off from low to high
+    throw_angle = compute_angles_3pts(right_knee, right_hip, left_knee)
+    throw_off = throw_angle > 45
+    if throw_off.any():
+        partial_scoring['throw_off_low_to_high'] = 1
+    partial_eval_frames[4] = frames[throw_off].tolist()
+
+    #criterion 5: discus release via wrist
+    #angle of the wrist->shoulder vector from the horizontal, no mock reference point needed
+    wrist_to_shoulder = right_shoulder - right_wrist
+    release_angle = np.degrees(np.arctan2(np.abs(wrist_to_shoulder[:, 1]), wrist_to_shoulder[:, 0]))
+    release_angle[np.hypot(wrist_to_shoulder[:, 0], wrist_to_shoulder[:, 1]) < 1e-5] = np.nan
+    released = release_angle > 30
+    if released.any():
+        partial_scoring['discus_release_via_wrist'] = 1
+    partial_eval_frames[5] = frames[released].tolist()
 
     return partial_scoring, partial_eval_frames
 
 # ------------- main evaluation --------------------
 def evaluate_discus_throw(player_coords):
 
+    #0) gather all frames into one keypoint array
+    kpts = keypoint_array(player_coords)
+    frame_ids = np.fromiter(
+        (data['frame'] for data in player_coords), dtype=np.int64, count=len(player_coords)
+    )
+
     #1) detect phase transitions
-    swing_end_index, turn_end_index = detect_phase_transitions(player_coords)
+    swing_end_index, turn_end_index = detect_phase_transitions(kpts)
     # logger.debug(f"swing_end_index={swing_end_index}, turn_end_index={turn_end_index}")
 
     #2) segment frames by phase
     swing_frames, turn_frames, throw_frames = segment_video_into_phases(
-        player_coords, swing_end_index, turn_end_index
+        frame_ids, kpts, swing_end_index, turn_end_index
     )
 
     #3) evaluate each phase
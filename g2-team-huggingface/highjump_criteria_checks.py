@@ -7,6 +7,8 @@ import numpy as np
 
 # ------------- Logging --------------------
 
+logger = logging.getLogger(__name__)
+
 # # Configure logging at the top of your module
 # logger = logging.getLogger(__name__)
 # printvel(logging.DEBUG)  # Capture all levels of logs
@@ -30,6 +32,12 @@ import numpy as np
 
 # ------------- Helper --------------------
 
+# COCO keypoint indices
+L_SHOULDER, R_SHOULDER = 5, 6
+L_HIP, R_HIP = 11, 12
+L_KNEE, R_KNEE = 13, 14
+L_ANKLE, R_ANKLE = 15, 16
+
 def get_keypoint(kpts, idx):
     if idx < len(kpts):
         return kpts[idx]
@@ -40,7 +48,7 @@ def distance_2d(point1, point2):
 
 def compute_angle_3pts(a, b, c):
     if a is None or b is None or c is None:
-        print(f"compute_angle_3pts: One or more keypoints are None: a={a}, b={b}, c={c}")
+        logger.debug("compute_angle_3pts: One or more keypoints are None: a=%s, b=%s, c=%s", a, b, c)
         return None
     ax, ay = a
     bx, by = b
@@ -50,44 +58,39 @@ def compute_angle_3pts(a, b, c):
     mag1 = math.hypot(v1[0], v1[1])
     mag2 = math.hypot(v2[0], v2[1])
     if mag1 < 1e-5 or mag2 < 1e-5:
-        print(f"compute_angle_3pts: Magnitude too small: mag1={mag1}, mag2={mag2}")
+        logger.debug("compute_angle_3pts: Magnitude too small: mag1=%s, mag2=%s", mag1, mag2)
         return None
     dot = v1[0] * v2[0] + v1[1] * v2[1]
-    cos_angle = max(-1.0, min(1.0, dot / (mag1 * mag2)))
-    try:
-        angle_rad = math.acos(cos_angle)
-        angle_deg = math.degrees(angle_rad)
-        print(f"compute_angle_3pts: Computed angle={angle_deg:.2f} degrees at point b={b}")
-        return angle_deg
-    except ValueError:
-        print(f"compute_angle_3pts: Invalid angle calculation with cos_angle={cos_angle}")
-        return None
+    cross = v1[0] * v2[1] - v1[1] * v2[0]
+    angle_deg = math.degrees(math.atan2(abs(cross), dot))
+    logger.debug("compute_angle_3pts: Computed angle=%.2f degrees at point b=%s", angle_deg, b)
+    return angle_deg
 
 def compute_speed(center_curr, center_prev):
     if center_prev is None:
-        print("compute_speed: Previous center is None.")
+        logger.debug("compute_speed: Previous center is None.")
         return 0.0
     dx = center_curr[0] - center_prev[0]
     dy = center_curr[1] - center_prev[1]
     speed = math.hypot(dx, dy)
-    print(f"compute_speed: Current center={center_curr}, Previous center={center_prev}, Speed={speed:.2f}")
+    logger.debug("compute_speed: Current center=%s, Previous center=%s, Speed=%.2f", center_curr, center_prev, speed)
     return speed
 
 def get_bbox_center_xyxy(box):
     if box is None or len(box) != 4:
-        print(f"get_bbox_center_xyxy: Invalid box={box}")
+        logger.debug("get_bbox_center_xyxy: Invalid box=%s", box)
         return None
     x1, y1, x2, y2 = box
     cx = (x1 + x2) / 2.0
     cy = (y1 + y2) / 2.0
-    print(f"get_bbox_center_xyxy: Box={box}, Center=({cx:.2f}, {cy:.2f})")
+    logger.debug("get_bbox_center_xyxy: Box=%s, Center=(%.2f, %.2f)", box, cx, cy)
     return (cx, cy)
 
 # phase detection and segmentation 
 
 def detect_phase_transitions(player_coords):
     if not player_coords:
-        print("detect_phase_transitions: player_coords is empty.")
+        logger.debug("detect_phase_transitions: player_coords is empty.")
         return 0, 0, 0
 
     total = len(player_coords)
@@ -99,7 +102,7 @@ def detect_phase_transitions(player_coords):
     takeoff_end = half
     flight_end = three_fourths
 
-    print(f"detect_phase_transitions: Phase transitions detected: runup_end={runup_end}, takeoff_end={takeoff_end}, flight_end={flight_end}")
+    logger.debug("detect_phase_transitions: Phase transitions detected: runup_end=%s, takeoff_end=%s, flight_end=%s", runup_end, takeoff_end, flight_end)
 
     return runup_end, takeoff_end, flight_end
 
@@ -110,7 +113,7 @@ def segment_video_into_phases(player_coords, runup_end, takeoff_end, flight_end)
     flight_frames = player_coords[takeoff_end:flight_end]
     landing_frames = player_coords[flight_end:]
 
-    print(f"segment_video_into_phases: Segments - runup_frames={len(runup_frames)}, takeoff_frames={len(takeoff_frames)}, flight_frames={len(flight_frames)}, landing_frames={len(landing_frames)}")
+    logger.debug("segment_video_into_phases: Segments - runup_frames=%s, takeoff_frames=%s, flight_frames=%s, landing_frames=%s", len(runup_frames), len(takeoff_frames), len(flight_frames), len(landing_frames))
 
     return runup_frames, takeoff_frames, flight_frames, landing_frames
 
@@ -121,16 +124,13 @@ def segment_video_into_phases(player_coords, runup_end, takeoff_end, flight_end)
 
 def is_running_tall(keypoints, shoulder_margin=30):
 
-    L_SHOULDER, R_SHOULDER = 5, 6
-    L_HIP, R_HIP = 11, 12
-
     left_shoulder = get_keypoint(keypoints, L_SHOULDER)
     right_shoulder = get_keypoint(keypoints, R_SHOULDER)
     left_hip = get_keypoint(keypoints, L_HIP)
     right_hip = get_keypoint(keypoints, R_HIP)
 
     if not (left_shoulder and right_shoulder and left_hip and right_hip):
-        print(f"is_running_tall: Missing keypoints - left_shoulder={left_shoulder}, right_shoulder={right_shoulder}, left_hip={left_hip}, right_hip={right_hip}")
+        logger.debug("is_running_tall: Missing keypoints - left_shoulder=%s, right_shoulder=%s, left_hip=%s, right_hip=%s", left_shoulder, right_shoulder, left_hip, right_hip)
         return False
 
     shoulder_y = (left_shoulder[1] + right_shoulder[1]) / 2.0
@@ -138,28 +138,24 @@ def is_running_tall(keypoints, shoulder_margin=30):
 
     # If shoulders are significantly above hips, it's "running tall"
     result = (shoulder_y + shoulder_margin) < hip_y
-    print(f"is_running_tall: shoulder_y={shoulder_y:.2f}, hip_y={hip_y:.2f}, Result={result}")
+    logger.debug("is_running_tall: shoulder_y=%.2f, hip_y=%.2f, Result=%s", shoulder_y, hip_y, result)
     return result
 
-def is_accelerating(speed_history, min_increase_count=3):
-    if len(speed_history) < min_increase_count + 1:
-        print(f"is_accelerating: Not enough speed history data (required={min_increase_count +1}, available={len(speed_history)})")
-        return False
-
-    consecutive_increases = 0
-    for i in range(1, len(speed_history)):
-        if speed_history[i] > speed_history[i - 1]:
-            consecutive_increases += 1
-            print(f"is_accelerating: Speed increased from {speed_history[i -1]:.2f} to {speed_history[i]:.2f}, consecutive_increases={consecutive_increases}")
-        else:
-            print(f"is_accelerating: Speed did not increase from {speed_history[i -1]:.2f} to {speed_history[i]:.2f}")
-            consecutive_increases = 0
-        if consecutive_increases >= min_increase_count:
-            print("is_accelerating: Acceleration criteria met.")
-            return True
-
-    print("is_accelerating: Acceleration criteria not met.")
-    return False
+def count_increases(speed_history, speed, consecutive_increases):
+    # Extend the run of consecutive speed increases by the newest speed, so the history is never rescanned
+    if speed_history and speed > speed_history[-1]:
+        consecutive_increases += 1
+        logger.debug("count_increases: Speed increased from %.2f to %.2f, consecutive_increases=%s", speed_history[-1], speed, consecutive_increases)
+    elif speed_history:
+        logger.debug("count_increases: Speed did not increase from %.2f to %.2f", speed_history[-1], speed)
+        consecutive_increases = 0
+    return consecutive_increases
+
+def is_accelerating(consecutive_increases, accelerating, min_increase_count=3):
+    # Once any run of increases has been long enough the run-up counts as accelerating
+    if not accelerating and consecutive_increases >= min_increase_count:
+        logger.debug("is_accelerating: Acceleration criteria met.")
+    return accelerating or consecutive_increases >= min_increase_count
 
 def evaluate_runup_phase(runup_frames):
     partial_scoring = {
@@ -169,9 +165,11 @@ def evaluate_runup_phase(runup_frames):
         1: []
     }
 
-    print(f"PHASE=Run-Up: Processing {len(runup_frames)} frames for Criterion 1.")
+    logger.debug("PHASE=Run-Up: Processing %s frames for Criterion 1.", len(runup_frames))
 
     speed_history = []
+    consecutive_increases = 0
+    accelerating = False
     initial_center = None
     center_previous = None
 
@@ -183,29 +181,31 @@ def evaluate_runup_phase(runup_frames):
         if boxes is not None:
             current_center = get_bbox_center_xyxy(boxes)
             if current_center is None:
-                print(f"Frame {frame}: Invalid bounding box, skipping speed calculation.")
+                logger.debug("Frame %s: Invalid bounding box, skipping speed calculation.", frame)
                 continue
 
             if initial_center is None:
                 initial_center = current_center
                 center_previous = current_center
-                print(f"Frame {frame}: Initial center set to {initial_center}")
+                logger.debug("Frame %s: Initial center set to %s", frame, initial_center)
             else:
                 speed = compute_speed(current_center, center_previous)
                 center_previous = current_center
                 if speed > 0:
+                    consecutive_increases = count_increases(speed_history, speed, consecutive_increases)
+                    accelerating = is_accelerating(consecutive_increases, accelerating)
                     speed_history.append(speed)
-                    print(f"Frame {frame}: Speed={speed:.2f} added to speed_history.")
+                    logger.debug("Frame %s: Speed=%.2f added to speed_history.", frame, speed)
 
-            if is_accelerating(speed_history) and is_running_tall(kpts):
+            if accelerating and is_running_tall(kpts):
                 partial_scoring['High Runup'] = 1
                 partial_eval_frames[1].append(frame)
-                print(f"Frame {frame}: Criterion 1 passed (accelerating and running tall).")
+                logger.debug("Frame %s: Criterion 1 passed (accelerating and running tall).", frame)
                 break  #criterion met, no need to check further frames
         else:
-            print(f"Frame {frame}: Missing bounding box for speed calculation.")
+            logger.debug("Frame %s: Missing bounding box for speed calculation.", frame)
 
-    print(f"Final scoring for Run-Up phase: {partial_scoring}")
+    logger.debug("Final scoring for Run-Up phase: %s", partial_scoring)
     return partial_scoring, partial_eval_frames
 
 ##################
@@ -214,10 +214,6 @@ def evaluate_runup_phase(runup_frames):
 
 def check_lean_in_curve(keypoints, angle_thresh=150):
 
-    L_SHOULDER = 5
-    R_SHOULDER = 6
-    R_HIP = 12
-
     p_left_shoulder = get_keypoint(keypoints, L_SHOULDER)
     p_right_shoulder = get_keypoint(keypoints, R_SHOULDER)
     p_right_hip = get_keypoint(keypoints, R_HIP)
@@ -240,7 +236,7 @@ def evaluate_leaning_phase(takeoff_frames):
         2: []
     }
 
-    print(f"PHASE=Take-Off: Processing {len(takeoff_frames)} frames for Criterion 2.")
+    logger.debug("PHASE=Take-Off: Processing %s frames for Criterion 2.", len(takeoff_frames))
 
     for data in takeoff_frames:
         frame = data.get('frame', 0)
@@ -261,7 +257,6 @@ def evaluate_leaning_phase(takeoff_frames):
 #Criterion 3#
 #############
 def check_knee_lift_at_takeoff(keypoints, angle_thresh=120):
-    L_HIP, L_KNEE, L_ANKLE = 11, 13, 15
     p_hip = get_keypoint(keypoints, L_HIP)
     p_knee = get_keypoint(keypoints, L_KNEE)
     p_ankle = get_keypoint(keypoints, L_ANKLE)
@@ -308,9 +303,6 @@ def evaluate_takeoff_phase(takeoff_frames):
 #################
 
 def check_hollow_back(keypoints, angle_thresh=160):
-    L_SHOULDER, R_SHOULDER = 5, 6
-    L_HIP, R_HIP = 11, 12
-    L_KNEE, R_KNEE = 13, 14
 
     left_shoulder = get_keypoint(keypoints, L_SHOULDER)
     right_shoulder = get_keypoint(keypoints, R_SHOULDER)
@@ -377,10 +369,6 @@ def evaluate_flight_phase(flight_frames):
 
 def check_l_shape_landing(keypoints, angle_range=(80, 100)):
 
-    L_SHOULDER, R_SHOULDER = 5, 6
-    L_HIP, R_HIP = 11, 12
-    L_ANKLE, R_ANKLE = 15, 16
-
     left_shoulder = get_keypoint(keypoints, L_SHOULDER)
     right_shoulder = get_keypoint(keypoints, R_SHOULDER)
     left_hip = get_keypoint(keypoints, L_HIP)
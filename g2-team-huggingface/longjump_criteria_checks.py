@@ -27,6 +27,14 @@ import os
 #    HELPER FUNCTIONS       #
 #############################
 
+# COCO keypoint indices
+NOSE = 0
+L_EYE, R_EYE = 1, 2
+L_SHOULDER, R_SHOULDER = 5, 6
+L_HIP, R_HIP = 11, 12
+L_KNEE, R_KNEE = 13, 14
+L_ANKLE, R_ANKLE = 15, 16
+
 def get_keypoint(kpts, idx):
     if idx < len(kpts):
         return kpts[idx]
@@ -50,14 +58,8 @@ def compute_angle_3pts(a, b, c):
     if mag1 < 1e-5 or mag2 < 1e-5:
         return None
     dot = v1[0] * v2[0] + v1[1] * v2[1]
-    cos_angle = max(-1.0, min(1.0, dot / (mag1 * mag2)))
-    try:
-        angle_rad = math.acos(cos_angle)
-        angle_deg = math.degrees(angle_rad)
-        return angle_deg
-    except ValueError:
-        # logger.debug(f"Invalid angle calculation with cos_angle={cos_angle}")
-        return None
+    cross = v1[0] * v2[1] - v1[1] * v2[0]
+    return math.degrees(math.atan2(abs(cross), dot))
 
 #############################
 #    CRITERION LOGIC        #
@@ -101,9 +103,8 @@ def is_accelerating(speed_history, min_increase_count=3, speed_threshold=10.0):
 BOARD_REGION = (195, 230, 350, 400)  # (xmin, xmax, ymin, ymax)
 
 def foot_on_board(kpts, board_region):
-    RIGHT_ANKLE = 16
-    foot_x = kpts[RIGHT_ANKLE][0]
-    foot_y = kpts[RIGHT_ANKLE][1]
+    foot_x = kpts[R_ANKLE][0]
+    foot_y = kpts[R_ANKLE][1]
 
     xmin, xmax, ymin, ymax = board_region
     if (xmin <= foot_x <= xmax) and (ymin <= foot_y <= ymax):
@@ -113,9 +114,6 @@ def foot_on_board(kpts, board_region):
     return False
 
 def check_not_looking_down(kpts):
-    NOSE = 0
-    L_EYE = 1
-    R_EYE = 2
     if kpts[NOSE][1] < kpts[L_EYE][1] and kpts[NOSE][1] < kpts[R_EYE][1]:
         # logger.debug("Athlete is not looking down.")
         return True
@@ -138,9 +136,6 @@ def evaluate_criterion2(kpts):
 
 # 3. Push-off foot is flat on the ground and body's center of gravity is above it (not on heel and leaning back)
 def check_foot_flat_and_com_over_foot(kpts):
-    R_ANKLE = 16
-    R_KNEE  = 14
-    R_HIP   = 12
     # Calculate angle at the knee
     p_ankle = (kpts[R_ANKLE][0], kpts[R_ANKLE][1])
     p_knee  = (kpts[R_KNEE][0],  kpts[R_KNEE][1])
@@ -173,9 +168,6 @@ def check_repulsive_leg_not_retracted(kpts):
     """
     Ensure the repulsive leg is not retracted too early by checking the left knee angle.
     """
-    L_HIP   = 11
-    L_KNEE  = 13
-    L_ANKLE = 15
     p_hip   = (kpts[L_HIP][0],   kpts[L_HIP][1])
     p_knee  = (kpts[L_KNEE][0],  kpts[L_KNEE][1])
     p_ankle = (kpts[L_ANKLE][0], kpts[L_ANKLE][1])
@@ -200,9 +192,6 @@ def check_sliding_landing(kpts):
     """
     Verify if the athlete lands with a sliding technique by checking the alignment of shoulders, hips, and ankles.
     """
-    L_SHOULDER, R_SHOULDER = 5, 6
-    L_HIP, R_HIP           = 11, 12
-    L_ANKLE, R_ANKLE       = 15, 16
 
     # Calculate average positions
     sh_x = (kpts[L_SHOULDER][0] + kpts[R_SHOULDER][0]) / 2.0
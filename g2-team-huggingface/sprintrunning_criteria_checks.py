@@ -1,50 +1,56 @@
 import ultralytics
 from ultralytics import YOLO
+import math
 import numpy as np
+from typing import Optional
 
 # Function to calculate angles between three points
 def calculate_angle(a, b, c):
-    a, b, c = np.array(a), np.array(b), np.array(c)
-    radians = np.arctan2(c[1] - b[1], c[0] - b[0]) - np.arctan2(a[1] - b[1], a[0] - b[0])
-    angle = np.abs(radians * 180.0 / np.pi)
+    radians = math.atan2(c[1] - b[1], c[0] - b[0]) - math.atan2(a[1] - b[1], a[0] - b[0])
+    angle = abs(math.degrees(radians))
     return angle if angle <= 180 else 360 - angle
 
+# Angle of the vector p_from -> p_to away from the vertical axis, in degrees
+def angle_from_vertical(p_from, p_to):
+    return math.degrees(math.atan2(abs(p_to[0] - p_from[0]), abs(p_to[1] - p_from[1])))
+
 # Function to retrieve a keypoint
 def get_keypoint(keypoints, keypoint_index):
     try:
-        return keypoints[keypoint_index].tolist()
-    except (IndexError, AttributeError):
+        return keypoints[keypoint_index]
+    except IndexError:
         return None
 
 # Function to calculate the midpoint between two points
 def get_midpoint(point1, point2):
     return [(point1[0] + point2[0]) / 2, (point1[1] + point2[1]) / 2]
 
-def get_player_coords(player_id: int, results, box_incl:bool = False, keypoints_as_list:bool = False):
+def get_player_coords(player_id: Optional[int], results, box_incl:bool = False, keypoints_as_list:bool = False):
     player_coords = []
 
-    # Iterate through each result with an associated frame index
-    for frame_index, result in enumerate(results):
-        if hasattr(result, 'boxes') and hasattr(result, 'keypoints'):
-            boxes = result.boxes
-            keypoints = result.keypoints
-
-            if boxes is not None and keypoints is not None:
-                tracking_ids = boxes.id
-                kp_xyn = keypoints.xyn
-                boxes_xy = boxes.xyxy
-
-                if tracking_ids is not None:
-                    for track_id, kp, box in zip(tracking_ids, kp_xyn, boxes_xy):
-                        if int(track_id) == player_id:
-                            if keypoints_as_list:
-                                kp = kp.tolist()
-                            # Append keypoints along with the frame number
-                            if box_incl:
-                                box = [int(coord) for coord in box]
-                                player_coords.append({'frame': frame_index, 'keypoints': kp, 'box': box})
-                            else:
-                                player_coords.append({'frame': frame_index, 'keypoints': kp})
+    # Each result is a per-frame dict of numpy arrays: 'keypoints' (xyn), 'keypoint_conf', 'boxes' (xyxy),
+    # tracking 'ids' and 'conf'
+    for result in results:
+        if player_id is None:
+            # No track IDs needed: follow the most confident person in each frame
+            if len(result['conf']) == 0:
+                continue
+            matches = [int(np.argmax(result['conf']))]
+        elif result['ids'] is not None:
+            matches = [i for i, track_id in enumerate(result['ids']) if int(track_id) == player_id]
+        else:
+            continue
+
+        for i in matches:
+            kp = result['keypoints'][i]
+            box = result['boxes'][i]
+            if keypoints_as_list:
+                kp = kp.tolist()
+            # Append keypoints along with the source-video frame number
+            coords = {'frame': result['frame'], 'keypoints': kp, 'keypoint_conf': result['keypoint_conf'][i]}
+            if box_incl:
+                coords['box'] = [int(coord) for coord in box]
+            player_coords.append(coords)
     return player_coords
 
 
@@ -74,7 +80,7 @@ def center_of_gravity_leans_forward(hip_positions, shoulder_positions, angle_thr
         return False
 
     # Calculate the torso angle
-    torso_angle = calculate_angle(hip_positions[-1], shoulder_positions[-1], [shoulder_positions[-1][0], hip_positions[-1][1]])
+    torso_angle = angle_from_vertical(shoulder_positions[-1], hip_positions[-1])
 
     # Check if the torso is leaning forward
     if torso_angle > angle_threshold:
@@ -98,13 +104,27 @@ def is_actively_clawing_at_ground(ankle_grounded, knee_grounded, hip_grounded,kn
     """
     # Calculate the angle at the ankle of the grounded foot
     clawing_angle = calculate_angle(hip_other_leg, knee_other_leg, knee_grounded)
-    knee_angle = calculate_angle(ankle_grounded, knee_grounded, hip_grounded) # check for full extension of the grounded leg
+    if not angle_threshold <= clawing_angle <= (180 - angle_threshold):
+        return False
 
-    if angle_threshold <= clawing_angle <= (180 - angle_threshold) and knee_angle>=170:
+    knee_angle = calculate_angle(ankle_grounded, knee_grounded, hip_grounded) # check for full extension of the grounded leg
+    if knee_angle>=170:
         return True
 
     return False
 
+def facing_side(player_coords):
+    """
+    Pick the side of the body facing the camera, i.e. the one whose shoulder and hip keypoints the pose model
+    is more confident about over the whole clip. Ties go to the right side.
+    """
+    left_conf = right_conf = 0.0
+    for data in player_coords:
+        keypoint_conf = data['keypoint_conf']
+        left_conf += keypoint_conf[5] + keypoint_conf[11]
+        right_conf += keypoint_conf[6] + keypoint_conf[12]
+    return 'left' if left_conf > right_conf else 'right'
+
 def evaluate_sprint_running(player_coords):
     scoring = {
         'Knees are lifted high': 0,
@@ -114,10 +134,6 @@ def evaluate_sprint_running(player_coords):
         'Actively clawing at the ground':0 # New criterion
     }
 
-    # Initialize lists to track knee angles over time
-    left_knee_angles = []
-    right_knee_angles = []
-
     # Initialize lists to track ankle and hip positions over time
     left_ankle_positions = []
     right_ankle_positions = []
@@ -127,11 +143,17 @@ def evaluate_sprint_running(player_coords):
     right_shoulder_positions = []
 
     evaluation_frames = {1:[],2:[],3:[],4:[],5:[]} # for validation
+
+    # The torso lean is measured on the side facing the camera, chosen once for the whole clip
+    if facing_side(player_coords) == 'left':
+        lean_hip_positions, lean_shoulder_positions = left_hip_positions, left_shoulder_positions
+    else:
+        lean_hip_positions, lean_shoulder_positions = right_hip_positions, right_shoulder_positions
    
 
     for data in player_coords:
         frame = data['frame']
-        keypoints = data['keypoints']
+        keypoints = data['keypoints'].tolist()
         left_shoulder = get_keypoint(keypoints, 5)
         right_shoulder = get_keypoint(keypoints, 6)
         left_hip = get_keypoint(keypoints, 11)
@@ -159,13 +181,6 @@ def evaluate_sprint_running(player_coords):
         left_hip_positions.append(left_hip)
         right_hip_positions.append(right_hip)
 
-        # Track knee angles over time
-        left_pelvis_angles = calculate_angle(left_shoulder,left_hip, left_knee)
-        right_pelvis_angles = calculate_angle(right_shoulder,right_hip, right_knee)
-
-        left_knee_angles.append(left_pelvis_angles)
-        right_knee_angles.append(right_pelvis_angles)
-
         # Criterion 1: Knees are high (knee lifted relative to hip)
         if sprint_running_crit_1(left_hip, left_knee) or \
            sprint_running_crit_1(right_hip, right_knee):
@@ -180,16 +195,14 @@ def evaluate_sprint_running(player_coords):
             evaluation_frames[2].append(frame)
 
 
-        # Criterion 3: Arms at 90 degrees
-        left_arm_angle = calculate_angle(left_shoulder, left_elbow, left_wrist)
-        right_arm_angle = calculate_angle(right_shoulder, right_elbow, right_wrist)
-
-        if 79 <= left_arm_angle <= 105 and 79 <= right_arm_angle <= 105:
+        # Criterion 3: Arms at 90 degrees (the right arm is only measured when the left one passes)
+        if 79 <= calculate_angle(left_shoulder, left_elbow, left_wrist) <= 105 and \
+           79 <= calculate_angle(right_shoulder, right_elbow, right_wrist) <= 105:
             scoring['Arms at a 90º angle'] = 1
             evaluation_frames[3].append(frame)
 
         # Criterion 4: Center of gravity leans forward - check if hips lean more forward compared to the feet
-        if center_of_gravity_leans_forward(right_hip_positions, right_shoulder_positions):
+        if center_of_gravity_leans_forward(lean_hip_positions, lean_shoulder_positions):
             scoring['Center of gravity leans forward'] = 1
             evaluation_frames[4].append(frame)
         